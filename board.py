@@ -1,11 +1,17 @@
 import chess
+from functools import cached_property
 from player import Player
 
 class ChessBoard:
+    # Istoricul pastreaza doar mutarile si cate un FEN la fiecare CHECKPOINT_INTERVAL
+    # mutari; board_state_history[i] reface tabla dupa i mutari la cerere
+    CHECKPOINT_INTERVAL = 16
     
     def __init__(self):
         self.board = chess.Board()
-        self.board_state_history = [self.board.copy()]
+        self.board_state_history = PositionIndex(start_fen=self.board.fen(), interval=self.CHECKPOINT_INTERVAL)
+        self._state = None
+        self._state_key = None
         self._setup_players()
     
     def _setup_players(self):
@@ -14,18 +20,32 @@ class ChessBoard:
         self.black_player = Player("black", self.board)
         self.current_player = self.white_player
     
+    @property
+    def state(self):
+        #Starea derivata a pozitiei curente; se reface doar cand pozitia s-a schimbat
+        # (push/pop prin make_move sau direct pe self.board, set_fen etc.)
+        board = self.board
+        key = (board.occupied_co[chess.WHITE], board.occupied_co[chess.BLACK], board.pawns, board.knights,
+               board.bishops, board.rooks, board.queens, board.kings, board.turn, board.castling_rights,
+               board.ep_square, board.halfmove_clock, len(board.move_stack), id(board))
+        if self._state is None or key != self._state_key:
+            self._state = BoardState(board)
+            self._state_key = key
+        return self._state
+    
     def make_move(self, move_uci, player):
-        if self.is_game_over():
+        state = self.state
+        if state.is_game_over:
             return False
             
         try:
             move = chess.Move.from_uci(move_uci)
-            if move not in self.board.legal_moves:
+            if not state.is_legal(move):
                 return False
             
             # Executăm mutarea
             self.board.push(move)
-            self.board_state_history.append(self.board.copy())
+            self.board_state_history.record(move, self.board)
             
             # Schimbăm jucătorul
             self.current_player = (
@@ -39,12 +59,143 @@ class ChessBoard:
             return False
     
     def is_game_over(self):
-        return self.board.is_game_over()
+        return self.state.is_game_over
     
     def is_checkmate(self):
-        return self.board.is_checkmate()
+        return self.state.is_checkmate
     
     def is_stalemate(self):
-        return self.board.is_stalemate()
+        return self.state.is_stalemate
+
+
+class BoardState:
+    # Valorile derivate ale unei pozitii (mutari legale, sah, rezultat, FEN),
+    # calculate la prima cerere si refolosite de interfata si de GameManager
+    def __init__(self, board: chess.Board):
+        self.board = board
+    
+    @cached_property
+    def fen(self):
+        return self.board.fen()
+    
+    @cached_property
+    def legal_moves(self):
+        return list(self.board.legal_moves)
+    
+    @cached_property
+    def moves_by_square(self):
+        #Mutarile legale grupate dupa patratul de plecare
+        moves = {}
+        for move in self.legal_moves:
+            moves.setdefault(move.from_square, []).append(move)
+        return moves
+    
+    def is_legal(self, move):
+        return move in self.moves_by_square.get(move.from_square, ())
     
+    @cached_property
+    def is_check(self):
+        return self.board.is_check()
+    
+    @cached_property
+    def checked_king(self):
+        #Patratul regelui aflat in sah (None daca nu e sah)
+        return self.board.king(self.board.turn) if self.is_check else None
+    
+    @cached_property
+    def outcome(self):
+        return self.board.outcome(claim_draw=False)
+    
+    @property
+    def is_game_over(self):
+        return self.outcome is not None
+    
+    @property
+    def is_checkmate(self):
+        return self.outcome is not None and self.outcome.termination == chess.Termination.CHECKMATE
+    
+    @property
+    def is_stalemate(self):
+        return self.outcome is not None and self.outcome.termination == chess.Termination.STALEMATE
+
 
+class PositionIndex:
+    # Pozitiile unei partide: un FEN la fiecare `interval` mutari plus lista de mutari.
+    # Orice pozitie se reface din cel mai apropiat FEN anterior si cel mult
+    # interval - 1 mutari, deci accesul nu depinde de lungimea partidei.
+    # Se foloseste ca o lista de table: index[i] este tabla dupa i mutari.
+    def __init__(self, moves=(), start_fen=chess.STARTING_FEN, interval=1):
+        self.start_fen = start_fen
+        self.interval = max(1, interval)
+        self.moves = []
+        self.snapshots = [start_fen]
+        # Tabla dupa ultima mutare, folosita de append (refacuta la nevoie dupa record)
+        self._board = None
+        for move in moves:
+            try:
+                self.append(move)
+            except ValueError:
+                # Partida salvata se opreste la prima mutare invalida
+                break
+    
+    def __len__(self):
+        #Numarul de pozitii (mutari + pozitia de start), ca la o lista de table
+        return len(self.moves) + 1
+    
+    def __getitem__(self, ply):
+        if ply < 0:
+            ply += len(self)
+        if not 0 <= ply < len(self):
+            raise IndexError("ply in afara partidei")
+        return self.board_at(ply)
+    
+    def __iter__(self):
+        board = chess.Board(self.start_fen)
+        yield board.copy()
+        for move in self.moves:
+            board.push(move)
+            yield board.copy()
+    
+    def append(self, move):
+        #Adauga o mutare (chess.Move sau UCI); ValueError daca nu este legala
+        if isinstance(move, str):
+            move = chess.Move.from_uci(move)
+        if self._board is None:
+            self._board = self.board_at(len(self.moves))
+        if not self._board.is_legal(move):
+            raise ValueError(f"Mutare ilegala: {move.uci()}")
+        self._board.push(move)
+        self._add(move, self._board)
+    
+    def record(self, move, board: chess.Board):
+        #Adauga o mutare deja jucata si validata; board este tabla de dupa mutare
+        self._board = None
+        self._add(move, board)
+    
+    def _add(self, move, board):
+        self.moves.append(move)
+        if len(self.moves) % self.interval == 0:
+            self.snapshots.append(board.fen())
+    
+    def board_at(self, ply):
+        #Tabla dupa primele ply mutari (0 = pozitia de start)
+        ply = max(0, min(ply, len(self.moves)))
+        snapshot = ply // self.interval
+        board = chess.Board(self.snapshots[snapshot])
+        for move in self.moves[snapshot * self.interval:ply]:
+            board.push(move)
+        return board
+    
+    def fen_at(self, ply):
+        ply = max(0, min(ply, len(self.moves)))
+        if ply % self.interval == 0:
+            return self.snapshots[ply // self.interval]
+        return self.board_at(ply).fen()
+    
+    def fens(self):
+        #Toate pozitiile, in ordine, refacand fiecare interval o singura data
+        board = chess.Board(self.start_fen)
+        yield board.fen()
+        for move in self.moves:
+            board.push(move)
+            yield board.fen()
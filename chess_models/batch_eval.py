@@ -0,0 +1,113 @@
+import sys
+import time
+
+import chess
+import numpy as np
+
+from chess_models.position import PAWN, KNIGHT, BISHOP, ROOK, QUEEN, KING
+
+# Cele 64 de patrate ale tablei 10x12, in ordinea a8..h1 (relativ la jucatorul la mutare)
+SQUARES = np.array([21 + rank * 10 + file for rank in range(8) for file in range(8)], dtype=np.intp)
+
+# Indicele piesei: 0 gol, 1..6 piesele jucatorului la mutare (P N B R Q K), 7..12 ale adversarului
+PIECE_CODES = (PAWN, KNIGHT, BISHOP, ROOK, QUEEN, KING)
+CODE_TO_INDEX = np.zeros(256, dtype=np.int8)
+for _index, _code in enumerate(PIECE_CODES, 1):
+    CODE_TO_INDEX[_code] = _index
+    CODE_TO_INDEX[_code + 32] = _index + 6
+
+# Aceiasi indici cand la mutare este negrul (literele mici sunt piesele lui)
+BLACK_CODE_TO_INDEX = np.zeros(256, dtype=np.int8)
+BLACK_CODE_TO_INDEX[65:91], BLACK_CODE_TO_INDEX[97:123] = CODE_TO_INDEX[97:123], CODE_TO_INDEX[65:91]
+
+# Cifrele din FEN devin patrate goale
+FEN_EMPTY = str.maketrans({str(n): '.' * n for n in range(1, 9)} | {'/': None})
+
+
+class BatchEvaluator:
+    # Evaluare vectorizata cu tabelele din ChessAI (int16): o pozitie este un vector de
+    # 64 de indici de piese, iar un lot de N pozitii se evalueaza intr-un singur apel.
+    # Scorul este din perspectiva jucatorului la mutare, ca pos.score.
+
+    def __init__(self, ai):
+        king_weight = ai.piece_weights['K']
+        tables = np.zeros((13, 64), dtype=np.int16)
+        for index, code in enumerate(PIECE_CODES, 1):
+            scores = np.array(ai.position_scores[code], dtype=np.int32)
+            # Regii se anuleaza reciproc; fara greutatea lor valorile incap pe int16
+            if code == KING:
+                scores[scores != 0] -= king_weight
+            tables[index] = scores[SQUARES]
+            tables[index + 6] = -scores[119 - SQUARES]
+        self.tables = tables
+        self.flat_tables = tables.ravel()
+        self.offsets = np.arange(64, dtype=np.intp)
+
+    def encode(self, pos):
+        #Pozitia interna ca vector de 64 de indici
+        board = np.frombuffer(bytes(pos.board), dtype=np.uint8)
+        return CODE_TO_INDEX[board[SQUARES]]
+
+    def encode_board(self, board: chess.Board):
+        #Tabla python-chess, vazuta de jucatorul la mutare (negrul vede tabla rotita)
+        encoded = np.zeros(64, dtype=np.int8)
+        for square, piece in board.piece_map().items():
+            relative = (7 - chess.square_rank(square)) * 8 + chess.square_file(square)
+            if board.turn == chess.BLACK:
+                relative = 63 - relative
+            encoded[relative] = piece.piece_type + (0 if piece.color == board.turn else 6)
+        return encoded
+
+    def encode_fen(self, fen):
+        #Ca encode_board, dar citind direct FEN-ul (mult mai rapid decat chess.Board)
+        placement, turn = fen.split()[:2]
+        board = np.frombuffer(placement.translate(FEN_EMPTY).encode(), dtype=np.uint8)
+        if turn == 'b':
+            return BLACK_CODE_TO_INDEX[board[::-1]]
+        return CODE_TO_INDEX[board]
+
+    def evaluate(self, encoded):
+        #Scorurile pentru un lot (N, 64) de pozitii codificate
+        encoded = np.atleast_2d(encoded)
+        return self.flat_tables[encoded.astype(np.intp) * 64 + self.offsets].sum(axis=1, dtype=np.int32)
+
+    def evaluate_positions(self, positions):
+        return self.evaluate(np.array([self.encode(pos) for pos in positions]))
+
+    def evaluate_fens(self, fens, batch_size=4096):
+        #Scorurile unei liste (oricat de mari) de FEN-uri, pe loturi
+        scores, batch = [], []
+        for fen in fens:
+            batch.append(self.encode_fen(fen))
+            if len(batch) == batch_size:
+                scores.append(self.evaluate(np.array(batch)))
+                batch = []
+        if batch:
+            scores.append(self.evaluate(np.array(batch)))
+        return np.concatenate(scores) if scores else np.zeros(0, dtype=np.int32)
+
+    def evaluate_children(self, ai, pos, moves=None):
+        #Toti copiii unui nod intr-un singur apel, din perspectiva jucatorului din pos
+        moves = list(ai.gen_moves(pos)) if moves is None else list(moves)
+        encoded = np.empty((len(moves), 64), dtype=np.int8)
+        for row, move in enumerate(moves):
+            pos.make_move(move, 0)
+            # Dupa mutare pos.rboard este tabla vazuta de jucatorul care a mutat
+            encoded[row] = CODE_TO_INDEX[np.frombuffer(bytes(pos.rboard), dtype=np.uint8)[SQUARES]]
+            pos.unmake_move()
+        return moves, self.evaluate(encoded) if moves else np.zeros(0, dtype=np.int32)
+
+
+if __name__ == "__main__":
+    # python -m chess_models.batch_eval pozitii.txt  (un FEN pe linie)
+    from chess_models.chess_ai import ChessAI
+
+    evaluator = BatchEvaluator(ChessAI(hash_mb=1, book=None))
+    with open(sys.argv[1]) as f:
+        fens = [line.strip() for line in f if line.strip()]
+    start = time.time()
+    scores = evaluator.evaluate_fens(fens)
+    elapsed = time.time() - start
+    for fen, score in zip(fens, scores):
+        print(f"{score:>6}  {fen}")
+    print(f"{len(fens)} pozitii in {elapsed:.2f}s", file=sys.stderr)
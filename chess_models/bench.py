@@ -0,0 +1,164 @@
+import argparse
+import json
+import os
+import platform
+import sys
+import time
+
+from board import ChessBoard
+from chess_models.chess_ai import ChessAI
+from chess_models.time_manager import TimeManager
+
+# Se incrementeaza la orice schimbare a listei de pozitii (rezultatele vechi nu mai sunt comparabile)
+BENCH_VERSION = 1
+
+# (nume, categorie, FEN)
+BENCH_POSITIONS = [
+    ("start", "opening", "rnbqkbnr/pppppppp/8/8/8/8/PPPPPPPP/RNBQKBNR w KQkq - 0 1"),
+    ("italian", "opening", "r1bqkb1r/pppp1ppp/2n2n2/4p3/2B1P3/5N2/PPPP1PPP/RNBQK2R w KQkq - 4 4"),
+    ("sicilian", "opening", "rnbqkb1r/pp2pppp/3p1n2/8/3NP3/8/PPP2PPP/RNBQKB1R w KQkq - 1 5"),
+    ("queens_gambit", "opening", "rnbqkb1r/ppp2ppp/4pn2/3p4/2PP4/2N5/PP2PPPP/R1BQKBNR w KQkq - 2 4"),
+    ("kiwipete", "middlegame", "r3k2r/p1ppqpb1/bn2pnp1/3PN3/1p2P3/2N2Q1p/PPPBBPPP/R3K2R w KQkq - 0 1"),
+    ("closed", "middlegame", "r4rk1/1pp1qppp/p1np1n2/2b1p1B1/2B1P1b1/P1NP1N2/1PP1QPPP/R4RK1 w - - 0 10"),
+    ("tactics", "middlegame", "r1b2rk1/2q1b1pp/p2ppn2/1p6/3QP3/1BN1B3/PPP3PP/R4RK1 w - - 0 1"),
+    ("black_to_move", "middlegame", "r2q1rk1/pp2ppbp/2p2np1/6B1/3PP1b1/Q1P2N2/P4PPP/3RKB1R b K - 0 13"),
+    ("rook_endgame", "endgame", "8/2p5/3p4/KP5r/1R3p1k/8/4P1P1/8 w - - 0 1"),
+    ("pawn_race", "endgame", "8/8/1p6/8/6P1/k7/8/5K2 w - - 0 1"),
+    ("queen_vs_rook", "endgame", "8/8/4k3/8/2r5/8/3Q4/4K3 w - - 0 1"),
+    ("minor_pieces", "endgame", "8/5k2/3b4/3p4/3P2N1/5K2/8/8 b - - 0 1"),
+]
+
+DEFAULT_DEPTH = 4
+DEFAULT_NODES = 200000
+DEFAULT_TOLERANCE = 0.10
+
+# Baseline-urile salvate in proiect pentru pozitiile de mai sus, cu setarile implicite (unul per backend);
+# din ele conteaza semnatura, timpii sunt doar cei ai masinii pe care au fost facute
+BASELINE_DIR = os.path.dirname(os.path.abspath(__file__))
+
+
+def default_baseline(backend):
+    return os.path.join(BASELINE_DIR, f"bench_baseline_{backend}.json")
+
+
+def run_bench(depth=DEFAULT_DEPTH, nodes=DEFAULT_NODES, backend='mailbox', hash_mb=16):
+    #Cauta fiecare pozitie de la zero pana la adancimea / numarul de noduri date
+    ai = ChessAI(hash_mb=hash_mb, backend=backend, book=None)
+    results = []
+    try:
+        for name, category, fen in BENCH_POSITIONS:
+            ai.new_game()
+            board = ChessBoard()
+            board.board.set_fen(fen)
+            pos = ai.position_from_board(board)
+            best_move = None
+            start = time.time()
+            try:
+                for _, _, _, move in ai.search(pos, TimeManager(depth=depth, nodes=nodes)):
+                    best_move = move or best_move
+            except TimeoutError:
+                pass
+            elapsed = time.time() - start
+            ai.update_stats()
+            # Ultima iteratie terminata (search poate fi oprit in mijlocul urmatoarei)
+            completed = ai.stats.depths[-1][0] if ai.stats.depths else 0
+            move = ai.chess_move(board.board, best_move)
+            results.append({
+                "name": name,
+                "category": category,
+                "depth": completed,
+                "nodes": ai.evaluated_positions,
+                "time": round(elapsed, 4),
+                "nps": int(ai.evaluated_positions / elapsed) if elapsed > 0 else 0,
+                "time_to_depth": [{"depth": d, "time": round(t, 4)} for d, t, _ in ai.stats.depths],
+                "bestmove": move.uci() if move else None,
+            })
+    finally:
+        ai.close()
+
+    total_nodes = sum(r["nodes"] for r in results)
+    total_time = sum(r["time"] for r in results)
+    return {
+        "version": BENCH_VERSION,
+        "backend": backend,
+        "depth": depth,
+        "node_limit": nodes,
+        "python": platform.python_version(),
+        # Ca la alte motoare: numarul total de noduri identifica determinist cautarea
+        "signature": total_nodes,
+        "nodes": total_nodes,
+        "time": round(total_time, 4),
+        "nps": int(total_nodes / total_time) if total_time > 0 else 0,
+        "positions": results,
+    }
+
+
+def compare(result, baseline, tolerance=DEFAULT_TOLERANCE, timing=False):
+    #Lista de regresii fata de baseline (goala daca totul e in toleranta). Semnatura (numarul
+    #de noduri) este determinista si se verifica mereu; NPS si timpul depind de masina, deci
+    #se compara doar la cerere (timing=True), cu un baseline facut pe aceeasi masina
+    if baseline.get("version") != result["version"]:
+        return [f"versiune diferita a pozitiilor: {baseline.get('version')} != {result['version']}"]
+    for key in ("backend", "depth", "node_limit"):
+        if baseline.get(key) != result[key]:
+            return [f"{key} diferit: {baseline.get(key)} != {result[key]}"]
+
+    regressions = []
+    if baseline.get("signature") != result["signature"]:
+        regressions.append(f"semnatura {baseline.get('signature')} -> {result['signature']} "
+                           f"(cautarea s-a schimbat; daca e intentionat, --save-baseline)")
+    if timing:
+        if result["nps"] < baseline["nps"] * (1 - tolerance):
+            regressions.append(f"NPS {result['nps']} < {baseline['nps']} (-{tolerance:.0%})")
+        if result["time"] > baseline["time"] * (1 + tolerance):
+            regressions.append(f"timp {result['time']:.2f}s > {baseline['time']:.2f}s (+{tolerance:.0%})")
+    return regressions
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark ChessAI pe un set fix de pozitii")
+    parser.add_argument("--depth", type=int, default=DEFAULT_DEPTH)
+    parser.add_argument("--nodes", type=int, default=DEFAULT_NODES)
+    parser.add_argument("--backend", choices=ChessAI.BACKENDS, default='mailbox')
+    parser.add_argument("--output", help="fisierul JSON cu rezultatele")
+    parser.add_argument("--baseline", help="rezultatele de referinta (JSON); implicit cel din proiect")
+    parser.add_argument("--save-baseline", action="store_true", help="scrie rezultatele ca noul baseline")
+    parser.add_argument("--timing", action="store_true",
+                        help="compara si NPS/timpul (doar cu un baseline facut pe aceeasi masina)")
+    parser.add_argument("--tolerance", type=float, default=DEFAULT_TOLERANCE)
+    args = parser.parse_args(argv)
+
+    result = run_bench(args.depth, args.nodes, args.backend)
+    for r in result["positions"]:
+        print(f"{r['name']:<16} depth {r['depth']:>2}  {r['nodes']:>8} noduri  "
+              f"{r['time']:>7.2f}s  {r['nps']:>7} nps  {r['bestmove']}")
+    print(f"Total: {result['nodes']} noduri, {result['time']:.2f}s, {result['nps']} nps, "
+          f"semnatura {result['signature']}")
+
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(result, f, indent=2)
+    # Baseline-ul din proiect e valabil doar pentru setarile implicite
+    baseline_path = args.baseline
+    if baseline_path is None and (args.depth, args.nodes) == (DEFAULT_DEPTH, DEFAULT_NODES):
+        baseline_path = default_baseline(args.backend)
+    if baseline_path and args.save_baseline:
+        with open(baseline_path, "w") as f:
+            json.dump(result, f, indent=2)
+            f.write("\n")
+        return 0
+
+    if baseline_path and os.path.exists(baseline_path):
+        with open(baseline_path, "r") as f:
+            baseline = json.load(f)
+        regressions = compare(result, baseline, args.tolerance, args.timing)
+        for regression in regressions:
+            print(f"REGRESIE: {regression}")
+        return 1 if regressions else 0
+    return 0
+
+
+if __name__ == "__main__":
+    # Rulare din radacina proiectului: python -m chess_models.bench [--backend bitboard]
+    # (compara cu chess_models/bench_baseline_<backend>.json)
+    sys.exit(main())
@@ -1,24 +1,44 @@
-from collections import namedtuple
 from itertools import count
 import chess
 import time
 from board import ChessBoard
-
-# Structuri de date pentru evaluare
-CacheEntry = namedtuple('CacheEntry', 'lower upper')
-BoardState = namedtuple('BoardState', 'board score white_castling black_castling ep kp')
-PieceMove = namedtuple('PieceMove', 'i j prom')
+from chess_models import bitboard
+from chess_models.bitboard import BitboardPosition
+from chess_models.move_picker import MovePicker, is_quiet
+from chess_models.time_manager import TimeManager
+from chess_models.position import Position, PieceMove, PIECE_WEIGHTS, PAWN, ROOK, KING, EMPTY, OFF_BOARD
+from chess_models.lazy_smp import LazySMP
+from chess_models.opening_book import OpeningBook, DEFAULT_BOOK_PATH
+from chess_models.tablebase import Tablebase
+from chess_models.session import GameSession
+from chess_models.search_stats import SearchStats
+from chess_models.transposition_table import TranspositionTable, SharedTranspositionTable
 
 class ChessAI:
-    def __init__(self, depth=3):
+    # Numarul maxim de ply-uri pentru care tinem mutari killer
+    MAX_PLY = 128
+
+    # Limitele implicite ale unei mutari: timp (secunde), adancime si noduri
+    DEFAULT_MOVE_TIME = 3.0
+    MAX_DEPTH = 4
+    MAX_NODES = 1000000
+    MAX_SEARCH_DEPTH = 60
+
+    # Scorul unei pozitii castigate dupa tabelele Syzygy (sub scorurile de mat)
+    TABLEBASE_WIN = 40000
+
+    # Generatoare de mutari disponibile; mailbox ramane implementarea de referinta si cea
+    # implicita, bitboard este experimental (aceeasi viteza, vezi bitboard.py)
+    BACKENDS = ('mailbox', 'bitboard')
+
+    def __init__(self, depth=3, hash_mb=16, backend='mailbox', threads=1, book=DEFAULT_BOOK_PATH,
+                 syzygy_path=None):
         # Indexare tablă 10x12
         self.ROOK_W1, self.ROOK_W2 = 91, 98
         self.ROOK_B1, self.ROOK_B2 = 21, 28
 
         # Valori piese pentru evaluare
-        self.piece_weights = {
-            "P": 102, "N": 285, "B": 322, "R": 482, "Q": 932, "K": 62000
-        }
+        self.piece_weights = dict(PIECE_WEIGHTS)
 
         # Tabele pentru evaluare pozitii
         self.position_scores = {
@@ -78,6 +98,9 @@ class ChessAI:
             self.position_scores[k] = sum((pad_line(table[i * 8 : i * 8 + 8]) for i in range(8)), ())
             self.position_scores[k] = (0,) * 20 + self.position_scores[k] + (0,) * 20
 
+        # Tabelele sunt indexate dupa codul piesei din tabla (bytearray)
+        self.position_scores = {ord(k): table for k, table in self.position_scores.items()}
+
         # Constante pentru evaluare
         self.CHECKMATE_LOWER = self.piece_weights['K'] - 10 * self.piece_weights['Q']
         self.CHECKMATE_UPPER = self.piece_weights['K'] + 10 * self.piece_weights['Q']
@@ -100,12 +123,54 @@ class ChessAI:
                   self.UP+self.RIGHT, self.DOWN+self.RIGHT,
                   self.DOWN+self.LEFT, self.UP+self.LEFT)
         }
+        self.move_vectors = {ord(k): vectors for k, vectors in self.move_vectors.items()}
+
+        # Alegem generatorul de mutari si tipul de pozitie asociat
+        if backend not in self.BACKENDS:
+            raise ValueError(f"Backend necunoscut: {backend}")
+        self.backend = backend
+        self.position_type = Position
+        if backend == 'bitboard':
+            bitboard.slider_tables()
+            self.position_type = BitboardPosition
+            self.gen_moves = bitboard.gen_moves
+
+        # Tabela de transpozitie cu dimensiune fixa (MB), partajata daca avem mai multe procese
+        self.threads = max(1, threads)
+        self.smp = None
+        if self.threads > 1:
+            self.tt = SharedTranspositionTable(hash_mb)
+            self.smp = LazySMP(self, self.threads - 1)
+        else:
+            self.tt = TranspositionTable(hash_mb)
 
-        # Cache pentru optimizare
-        self.eval_cache = {}
-        self.best_move_cache = {}
+        # Ordonarea mutarilor: doua mutari killer per ply si istoric [piesa][destinatie]
+        self.killers = [[None, None] for _ in range(self.MAX_PLY)]
+        self.history = [0] * (128 * 120)
         self.seen_positions = set()
         self.evaluated_positions = 0
+        self.root_ply = 0
+        self.time_manager = TimeManager()
+
+        # Pozitia partidei curente, sincronizata intre mutari
+        self.session = GameSession(self)
+
+        # Statisticile ultimei cautari si ascultatorii de evenimente (fara ascultatori nu emitem nimic)
+        self.stats = SearchStats()
+        self.listeners = []
+
+        # Contoarele per nod (quiescence, TT, taieri) costa la fiecare nod; le numaram doar
+        # la cerere sau cand cineva asculta cautarea
+        self.collect_stats = False
+        self.counting = False
+
+        # Cartea de deschideri (Polyglot), consultata inainte de cautare; None daca lipseste
+        self.book = OpeningBook.open(book)
+
+        # Tabelele Syzygy locale (optional); directoare separate prin os.pathsep
+        self.syzygy_path = syzygy_path
+        self.tablebase = Tablebase.open(syzygy_path)
+        self.tablebase_scores = {2: self.TABLEBASE_WIN, 1: 1, 0: 0, -1: -1, -2: -self.TABLEBASE_WIN}
 
     def convert_board_format(self, board: ChessBoard) -> str:
         #Convertim tabela python chess in formatul 10x12
@@ -135,67 +200,109 @@ class ChessAI:
     def bound(self, pos, gamma, depth, root=True):
         #Cautam o mutare mai buna
         self.evaluated_positions += 1
+        ply = len(pos.history) - self.root_ply
+
+        # Verificam ceasul doar o data la CHECK_INTERVAL noduri
+        if not self.evaluated_positions & (TimeManager.CHECK_INTERVAL - 1):
+            self.time_manager.check(self.evaluated_positions)
 
-        #Print pentru debugging
-        if root:
-            # Determinam culoarea pieselor
-            is_white = any(c.isupper() for c in pos.board if c in 'RNBQK')
-            print(f"Evaluare la depth {depth} pentru {'alb' if is_white else 'negru'}")
+        stats = self.stats if self.counting else None
+        if stats is not None and depth <= 0:
+            stats.qnodes += 1
 
         # Verificam sah mat
         if pos.score <= -self.CHECKMATE_LOWER:
             return -self.CHECKMATE_UPPER
 
-        # Verificam cache
-        entry = self.eval_cache.get((pos, depth, root), CacheEntry(-self.CHECKMATE_UPPER, self.CHECKMATE_UPPER))
-        if entry.lower >= gamma: return entry.lower
-        if entry.upper < gamma: return entry.upper
+        # O pozitie care a mai aparut in partida este remiza prin repetitie
+        if not root and pos.key in self.seen_positions:
+            return 0
+
+        # Extindem cu un ply pozitiile in care suntem in sah (nu si in quiescence),
+        # dar nu si cand adversarul si-a lasat regele in sah (mutarea lui era ilegala)
+        in_check = None
+        if depth > 0 and not root:
+            in_check = pos.in_check()
+            if in_check:
+                pos.rotate()
+                if not pos.in_check():
+                    depth += 1
+                pos.rotate()
+
+        # Verificam tabela de transpozitie
+        entry = self.tt.probe(pos.key)
+        if stats is not None:
+            stats.tt_probes += 1
+        lower, upper = -self.CHECKMATE_UPPER, self.CHECKMATE_UPPER
+        if entry is not None:
+            if stats is not None:
+                stats.tt_hits += 1
+            if entry.depth >= depth:
+                if entry.lower >= gamma:
+                    if stats is not None:
+                        stats.tt_cutoffs += 1
+                    return entry.lower
+                if entry.upper < gamma:
+                    if stats is not None:
+                        stats.tt_cutoffs += 1
+                    return entry.upper
+                if entry.depth == depth:
+                    lower, upper = entry.lower, entry.upper
+
+        # Scor exact din tabelele Syzygy cand au ramas destule putine piese
+        if self.tablebase is not None and not root and depth > 0:
+            wdl = self.tablebase.probe_wdl(pos)
+            if wdl is not None:
+                score = self.tablebase_scores[wdl]
+                self.tt.store(pos.key, depth, score, score)
+                return score
+
+        def search_move(move, delta):
+            # Facem mutarea pe loc, cautam si o anulam
+            pos.make_move(move, delta)
+            score = -self.bound(pos, 1-gamma, depth-1, root=False)
+            pos.unmake_move()
+            return score
 
         def moves():
             # Incercam mai intai null move
-            if depth > 2 and not root and any(c in pos.board for c in 'RBNQ'):
-                yield None, -self.bound(self.rotate(pos, nullmove=True), 1-gamma, depth-3, root=False)
+            if depth > 2 and not root and not in_check and pos.non_pawn:
+                pos.make_null()
+                score = -self.bound(pos, 1-gamma, depth-3, root=False)
+                pos.unmake_null()
+                yield None, score
 
             # QSearch pentru cautare rapida
             if depth <= 0:
                 yield None, pos.score
                 #Generam doar capturi si promovari de regina
-                for move in sorted(self.gen_moves(pos), key=lambda m: self.value(pos, m), reverse=True):
-                    if self.value(pos, move) >= 150:  
-                        score = -self.bound(self.move(pos, move), 1-gamma, depth-1, root=False)
-                        yield move, score
+                for move, delta in MovePicker(self, pos, quiescence=True):
+                    yield move, search_move(move, delta)
                 return
 
-            # Incercam cea mai buna mutare din cache
-            killer = self.best_move_cache.get(pos)
-            if killer:
-                yield killer, -self.bound(self.move(pos, killer), 1-gamma, depth-1, root=False)
-
-            # celelalte mutari posibile
-            for move in sorted(self.gen_moves(pos), key=lambda m: self.value(pos, m), reverse=True):
-                #limitam numarul de noduri
-                if self.evaluated_positions > 1000000:  
-                    break
-                score = -self.bound(self.move(pos, move), 1-gamma, depth-1, root=False)
-                yield move, score
+            # Mutarea din tabela de transpozitie, capturi, killer, apoi restul mutarilor
+            tt_move = PieceMove(*entry.move) if entry is not None and entry.move else None
+            killers = self.killers[ply] if ply < self.MAX_PLY else ()
+            for move, delta in MovePicker(self, pos, tt_move, killers):
+                yield move, search_move(move, delta)
 
         #Evaluam toate mutarile posibile
         best, best_move = -self.CHECKMATE_UPPER, None
-        for move, score in moves():
+        for searched, (move, score) in enumerate(moves(), 1):
             if score > best:
                 best, best_move = score, move
             if best >= gamma:
+                if stats is not None:
+                    stats.beta_cutoffs += 1
+                    if searched == 1:
+                        stats.first_move_cutoffs += 1
                 break
 
         #daca nu am gasit nicio mutare buna
         if depth > 0 and best == -self.CHECKMATE_UPPER:
-            #Verificam sahul pentru adversar
-            flipped = self.rotate(pos, nullmove=True)
-            in_check = False
-            for move in self.gen_moves(flipped):
-                if self.value(flipped, move) >= self.CHECKMATE_LOWER:
-                    in_check = True
-                    break
+            #Verificam daca suntem in sah
+            if in_check is None:
+                in_check = pos.in_check()
             #Scor 0 pentru stalemate
             if not in_check:
                 best = 0 
@@ -203,52 +310,91 @@ class ChessAI:
             else:
                 best = -self.CHECKMATE_LOWER  
 
-        # Actualizam cache-ul
+        # Mutarea linistita care a produs taietura devine killer si primeste bonus in istoric
+        if best >= gamma and depth > 0 and best_move is not None and is_quiet(pos, best_move):
+            if ply < self.MAX_PLY and self.killers[ply][0] != best_move:
+                self.killers[ply][1] = self.killers[ply][0]
+                self.killers[ply][0] = best_move
+            self.history[pos.board[best_move.i] * 120 + best_move.j] += depth * depth
+
+        # Actualizam tabela de transpozitie
         if best >= gamma:
-            self.best_move_cache[pos] = best_move
-            self.eval_cache[(pos, depth, root)] = CacheEntry(best, entry.upper)
+            self.tt.store(pos.key, depth, best, upper, best_move)
         if best < gamma:
-            self.eval_cache[(pos, depth, root)] = CacheEntry(entry.lower, best)
+            self.tt.store(pos.key, depth, lower, best)
 
         return best
 
-    def rotate(self, pos, nullmove=False):
-        #roteste pozitia pentru a vedea perspectiva celuilalt jucator
-        return BoardState(
-            pos.board[::-1].swapcase(),
-            -pos.score,
-            pos.black_castling, pos.white_castling,
-            119 - pos.ep if pos.ep and not nullmove else 0,
-            119 - pos.kp if pos.kp and not nullmove else 0,
-        )
+    def tt_move(self, pos):
+        #Cea mai buna mutare cunoscuta pentru pozitie
+        entry = self.tt.probe(pos.key)
+        return PieceMove(*entry.move) if entry is not None and entry.move else None
+
+    def principal_variation(self, pos, max_length):
+        #Varianta principala, urmand mutarile din tabela de transpozitie
+        pv, keys = [], set()
+        while len(pv) < max_length and pos.key not in keys:
+            keys.add(pos.key)
+            move = self.tt_move(pos)
+            if move is None or move not in set(self.gen_moves(pos)):
+                break
+            pv.append(move)
+            pos.make_move(move, self.value(pos, move))
+        for _ in pv:
+            pos.unmake_move()
+        return pv
+
+    def chess_principal_variation(self, board: ChessBoard, max_length):
+        #Varianta principala pornind de la board, ca mutari python-chess
+        pos = self.position_from_board(board)
+        replay, moves = board.board.copy(stack=False), []
+        for internal in self.principal_variation(pos, max_length):
+            move = self.chess_move(replay, internal)
+            if move is None:
+                break
+            moves.append(move)
+            replay.push(move)
+        return moves
 
-    def value(self, pos, move):
+    def evaluate(self, pos):
+        #Scorul static din tabelele de pozitie, din perspectiva jucatorului la mutare;
+        #make_move il tine apoi la zi incremental, prin value
+        score = 0
+        for i, p in enumerate(pos.board):
+            if 64 < p < 91:
+                score += self.position_scores[p][i]
+            elif p > 96:
+                score -= self.position_scores[p - 32][119 - i]
+        return score
+
+    def value(self, pos, move, is_black=None):
         #Calculeaza valuarea unei mutari
         i, j = move.i, move.j
         p, q = pos.board[i], pos.board[j]
         
-        # Determinam daca jucam cu negrele
-        is_black = pos.board.find('k') > pos.board.find('K')
+        # Determinam daca jucam cu negrele (MovePicker il calculeaza o data per nod)
+        if is_black is None:
+            is_black = pos.is_black()
         
         # scorul pozitiei fata de mutarea trecuta
         score = self.position_scores[p][j] - self.position_scores[p][i]
         
         # Bonus pentru captura
-        if q.islower():
-            score += self.position_scores[q.upper()][119-j]
+        if q > 96:
+            score += self.position_scores[q - 32][119-j]
         
         # Bonus/Penalizare pentru pozitia regelui
         if abs(j - pos.kp) < 2:
-            score += self.position_scores['K'][119-j]
+            score += self.position_scores[KING][119-j]
         
         # Bonus Rocada
-        if p == 'K' and abs(i-j) == 2:
-            score += self.position_scores['R'][(i+j)//2]
-            score -= self.position_scores['R'][self.ROOK_W1 if j < i else self.ROOK_W2]
+        if p == KING and abs(i-j) == 2:
+            score += self.position_scores[ROOK][(i+j)//2]
+            score -= self.position_scores[ROOK][self.ROOK_W1 if j < i else self.ROOK_W2]
         
         # Promovare pion
-        if p == 'P' and self.ROOK_B1 <= j <= self.ROOK_B2:
-            score += self.position_scores[move.prom][j] - self.position_scores['P'][j]
+        if p == PAWN and self.ROOK_B1 <= j <= self.ROOK_B2:
+            score += self.position_scores[ord(move.prom)][j] - self.position_scores[PAWN][j]
         
         # Inversam scorul final pentru negru
         if is_black:
@@ -258,19 +404,21 @@ class ChessAI:
 
     def gen_moves(self, pos):
         #Genereaza Toate Mutarile legale
-        for i, p in enumerate(pos.board):
-            if not p.isupper(): continue
+        board = pos.board
+        for i, p in enumerate(board):
+            # Doar piesele noastre (majuscule)
+            if not 64 < p < 91: continue
             for d in self.move_vectors[p]:
                 for j in count(i + d, d):
-                    q = pos.board[j]
+                    q = board[j]
                     #Evita iesirea de pe tabla si piesele noastre
-                    if q.isspace() or q.isupper(): break
+                    if q == OFF_BOARD or 64 < q < 91: break
                     
                     # Miscarea pionului
-                    if p == "P":
-                        if d in (self.UP, self.UP + self.UP) and q != ".": break
-                        if d == self.UP + self.UP and (i < self.ROOK_W1 + self.UP or pos.board[i + self.UP] != "."): break
-                        if (d in (self.UP + self.LEFT, self.UP + self.RIGHT) and q == "." and 
+                    if p == PAWN:
+                        if d in (self.UP, self.UP + self.UP) and q != EMPTY: break
+                        if d == self.UP + self.UP and (i < self.ROOK_W1 + self.UP or board[i + self.UP] != EMPTY): break
+                        if (d in (self.UP + self.LEFT, self.UP + self.RIGHT) and q == EMPTY and 
                             j not in (pos.ep, pos.kp, pos.kp - 1, pos.kp + 1)): break
                         # Promovare pion
                         if self.ROOK_B1 <= j <= self.ROOK_B2:
@@ -282,164 +430,217 @@ class ChessAI:
                     yield PieceMove(i, j, "")
                     
                     # Piesele care nu se pot glisa
-                    if p in "PNK" or q.islower(): break
+                    if p in b"PNK" or q > 96: break
                     
                     # Rocada
-                    if i == self.ROOK_W1 and pos.board[j + self.RIGHT] == "K" and pos.white_castling[0]:
+                    if i == self.ROOK_W1 and board[j + self.RIGHT] == KING and pos.white_castling[0]:
                         yield PieceMove(j + self.RIGHT, j + self.LEFT, "")
-                    if i == self.ROOK_W2 and pos.board[j + self.LEFT] == "K" and pos.white_castling[1]:
+                    if i == self.ROOK_W2 and board[j + self.LEFT] == KING and pos.white_castling[1]:
                         yield PieceMove(j + self.LEFT, j + self.RIGHT, "")
 
-    def search(self, pos):
+    def default_time_manager(self):
+        #Limitele folosite cand interfata nu da un ceas
+        return TimeManager(movetime=self.DEFAULT_MOVE_TIME, depth=self.MAX_DEPTH, nodes=self.MAX_NODES)
+
+    def search(self, pos, time_manager=None, start_depth=1):
         #Cautare MTD bi
         self.evaluated_positions = 0
-        self.seen_positions = set()
-        self.eval_cache.clear()
+        self.root_ply = len(pos.history)
+        self.tt.new_search()
+        self.stats.reset()
+        self.counting = self.collect_stats or bool(self.listeners)
+        if self.tablebase is not None:
+            self.tablebase.reset_stats()
+
+        # Killer-ele nu se pastreaza intre cautari, istoricul doar se injumatateste
+        self.killers = [[None, None] for _ in range(self.MAX_PLY)]
+        self.history = [h // 2 for h in self.history]
         
-        # Timpul maxim permis per depth
-        MAX_TIME_PER_DEPTH = 0.5  # secunde
-        search_start_time = time.time()
+        # Limitele de timp/noduri/adancime pentru aceasta cautare
+        self.time_manager = time_manager or self.default_time_manager()
+        self.time_manager.start()
         
-        for depth in range(1, 5):  # Cautam la depth 4
-            print(f"\nÎncepem analiza pentru depth {depth} (timp total: {time.time() - search_start_time:.2f}s)")
-            start_positions = self.evaluated_positions
+        for depth in range(start_depth, self.MAX_SEARCH_DEPTH + 1):
             start_time = time.time()
             
             # Pentru depth 1, facem doar o singura evaluare rapida
             if depth == 1:
                 score = self.bound(pos, 0, depth, root=True)
-                print(f"  Depth 1 rapid (timp: {time.time() - start_time:.2f}s):")
-                print(f"    Score: {score}")
-                print(f"    Poziții evaluate: {self.evaluated_positions - start_positions}")
-                yield depth, 0, score, self.best_move_cache.get(pos)
+                if self.listeners:
+                    self.emit("iteration", depth=depth, gamma=0, score=score, nodes=self.evaluated_positions)
+                yield depth, 0, score, self.tt_move(pos)
+                self.finish_depth(depth, start_time, score)
+                if self.time_manager.should_stop(depth, self.evaluated_positions):
+                    return
                 continue
             
             # Pentru depth > 1, folosim MTD-bi cu limite de timp
             lower, upper = -self.CHECKMATE_LOWER, self.CHECKMATE_LOWER
-            iteration = 0
             while lower < upper - 15:  
-                current_time = time.time() - start_time
-                if current_time > MAX_TIME_PER_DEPTH:
-                    print(f"  Oprim depth {depth} - timp excedat ({current_time:.2f}s)")
-                    break
+                if self.time_manager.should_stop(nodes=self.evaluated_positions):
+                    if self.listeners:
+                        self.emit("stop", depth=depth, time=round(self.time_manager.elapsed(), 4))
+                    return
                 
-                iteration += 1
                 gamma = (lower + upper + 1) // 2
                 score = self.bound(pos, gamma, depth, root=True)
-                
-                print(f"  Iterația {iteration} la depth {depth} (timp: {time.time() - start_time:.2f}s):")
-                print(f"    Score: {score}")
-                print(f"    Poziții evaluate: {self.evaluated_positions - start_positions}")
+                if self.listeners:
+                    self.emit("iteration", depth=depth, gamma=gamma, score=score, nodes=self.evaluated_positions)
                 
                 if score >= gamma:
                     lower = score
                 if score < gamma:
                     upper = score
-                yield depth, gamma, score, self.best_move_cache.get(pos)
+                yield depth, gamma, score, self.tt_move(pos)
             
-            print(f"Terminat depth {depth} (timp total depth: {time.time() - start_time:.2f}s):")
-            print(f"  Total poziții evaluate: {self.evaluated_positions - start_positions}")
-            print(f"  Timp total search: {time.time() - search_start_time:.2f}s")
-            print(f"  Scor final: {(lower + upper) / 2}")
+            self.finish_depth(depth, start_time, (lower + upper) // 2)
+            if self.time_manager.should_stop(depth, self.evaluated_positions):
+                return
 
-    def get_best_move(self, board: ChessBoard) -> chess.Move:
-        #Gasirea celei mai bune mutari in UCI
-        self.evaluated_positions = 0
-        self.start_time = time.time()
-        
-        # Determinam daca jucam cu negrele
-        is_black = board.current_player == board.black_player
+    def update_stats(self):
+        #Copiem in statistici contoarele tinute in alta parte (noduri, Syzygy)
+        stats = self.stats
+        stats.nodes = self.evaluated_positions
+        stats.end_time = time.time()
+        if self.tablebase is not None:
+            stats.tb_probes, stats.tb_hits = self.tablebase.probes, self.tablebase.hits
+
+    def finish_depth(self, depth, start_time, score):
+        stats = self.stats
+        stats.depths.append((depth, time.time() - start_time, self.evaluated_positions))
+        if self.listeners:
+            self.update_stats()
+            self.emit("depth", depth=depth, score=score, **stats.as_dict())
+
+    def add_listener(self, listener):
+        self.listeners.append(listener)
+
+    def remove_listener(self, listener):
+        self.listeners.remove(listener)
+
+    def emit(self, event, **data):
+        #Trimitem evenimentul ascultatorilor; apelantii verifica self.listeners inainte,
+        #ca sa nu construiasca argumentele degeaba
+        for listener in self.listeners:
+            listener.on_event(event, data)
+
+    def position_from_board(self, board: ChessBoard):
+        #Pozitia interna, din perspectiva jucatorului la mutare
+        is_black = board.board.turn == chess.BLACK
         
         # Convertim în formatul intern
-        pos = BoardState(
-            self.convert_board_format(board),
-            0,
-            (board.board.has_queenside_castling_rights(chess.WHITE),
-             board.board.has_kingside_castling_rights(chess.WHITE)),
-            (board.board.has_queenside_castling_rights(chess.BLACK),
-             board.board.has_kingside_castling_rights(chess.BLACK)),
-            board.board.ep_square if board.board.ep_square else 0,
-            0
-        )
+        board_str = self.convert_board_format(board)
+        white_castling = (board.board.has_queenside_castling_rights(chess.WHITE),
+                          board.board.has_kingside_castling_rights(chess.WHITE))
+        # Pentru negru, dupa rotire turnul de pe 91 este cel de pe h8
+        black_castling = (board.board.has_kingside_castling_rights(chess.BLACK),
+                          board.board.has_queenside_castling_rights(chess.BLACK))
+        ep_square = board.board.ep_square
+        ep = 91 - 10 * chess.square_rank(ep_square) + chess.square_file(ep_square) if ep_square else 0
+        pos = self.position_type(board_str, 0, white_castling, black_castling, ep, 0)
+        
+        # Scorul absolut (nu 0), ca 0 sa insemne egalitate si sa se potriveasca cu remiza din Syzygy
+        pos.score = self.evaluate(pos)
         
         # Rotim tabla daca jucam cu negru
         if is_black:
-            pos = self.rotate(pos)
+            pos.rotate()
+        return pos
+
+    def get_best_move(self, board: ChessBoard, time_manager=None) -> chess.Move:
+        #Gasirea celei mai bune mutari in UCI
+        self.evaluated_positions = 0
+        time_manager = time_manager or self.default_time_manager()
+        
+        # Mutare din cartea de deschideri, fara cautare
+        if self.book is not None:
+            book_move = self.book.pick(board.board)
+            if book_move is not None:
+                return book_move
+        
+        # In final, mutarea optima dupa DTZ din tabelele Syzygy
+        if self.tablebase is not None:
+            self.tablebase.reset_stats()
+            tablebase_move = self.tablebase.root_move(board.board)
+            if tablebase_move is not None:
+                return tablebase_move
+        
+        # Pozitia partidei, adusa la zi cu mutarile facute de la ultimul apel
+        pos = self.session.sync(board)
+        
+        # Procesele ajutatoare (Lazy SMP) pornesc pe aceeasi pozitie
+        if self.smp is not None:
+            self.smp.start(pos)
         
         best_move = None
         try:
-            for depth, gamma, score, move in self.search(pos):
+            for depth, gamma, score, move in self.search(pos, time_manager):
                 if move:
                     best_move = move
-                    print(f"info depth {depth} score cp {score} nodes {self.evaluated_positions}")
-                if depth >= 4 or time.time() - self.start_time > 3:
-                    break
         except TimeoutError:
+            # Oprire in mijlocul unei iteratii: pastram mutarea din ultima iteratie terminata
             pass
+        finally:
+            if self.smp is not None:
+                self.smp.stop()
+            self.session.finish()
         
         # Convertim in format python-chess
-        if best_move:
-            from_rank = 7 - ((best_move.i - 20) // 10)
-            from_file = (best_move.i - 20) % 10 - 1
-            to_rank = 7 - ((best_move.j - 20) // 10)
-            to_file = (best_move.j - 20) % 10 - 1
-            
-            # Inversam coordonatele pentru negru
-            if is_black:
-                from_rank = 7 - from_rank
-                from_file = 7 - from_file
-                to_rank = 7 - to_rank
-                to_file = 7 - to_file
-            
-            move = chess.Move(
-                chess.square(from_file, from_rank),
-                chess.square(to_file, to_rank),
-                promotion=chess.QUEEN if best_move.prom == 'Q' else None
-            )
-            
-            if move in board.board.legal_moves:
-                return move
-            
-        return list(board.board.legal_moves)[0]
+        move = self.chess_move(board.board, best_move) or list(board.board.legal_moves)[0]
+        self.update_stats()
+        if self.listeners:
+            self.emit("bestmove", move=move.uci(), **self.stats.as_dict())
+        return move
 
-    def move(self, pos, move):
-        #executam o miscare
-        i, j, prom = move
-        p, q = pos.board[i], pos.board[j]
-        
-        # Functie helper pentru actualizarea tabelei
-        put = lambda board, i, p: board[:i] + p + board[i + 1:]
-        
-        # Copiem variabilele și resetam en passant
-        board = pos.board
-        white_castling, black_castling, ep, kp = pos.white_castling, pos.black_castling, 0, 0
-        score = pos.score + self.value(pos, move)
-        
-        # Executam mutarea
-        board = put(board, j, board[i])
-        board = put(board, i, ".")
-        
-        # Actualizam drepturile de rocada
-        if i == self.ROOK_W1: white_castling = (False, white_castling[1])
-        if i == self.ROOK_W2: white_castling = (white_castling[0], False)
-        if j == self.ROOK_B1: black_castling = (black_castling[0], False)
-        if j == self.ROOK_B2: black_castling = (False, black_castling[1])
+    def internal_move(self, board: chess.Board, move: chess.Move):
+        #Mutarea python-chess in formatul intern, relativ la jucatorul la mutare
+        def index(square):
+            i = 91 - 10 * chess.square_rank(square) + chess.square_file(square)
+            return 119 - i if board.turn == chess.BLACK else i
+        prom = chess.piece_symbol(move.promotion).upper() if move.promotion else ""
+        return PieceMove(index(move.from_square), index(move.to_square), prom)
+
+    def chess_move(self, board: chess.Board, move):
+        #Mutarea interna (relativa la jucatorul la mutare) in format python-chess, daca e legala
+        if not move:
+            return None
+        from_rank = 7 - ((move.i - 20) // 10)
+        from_file = (move.i - 20) % 10 - 1
+        to_rank = 7 - ((move.j - 20) // 10)
+        to_file = (move.j - 20) % 10 - 1
         
-        # Rocada
-        if p == "K":
-            white_castling = (False, False)
-            if abs(j - i) == 2:
-                kp = (i + j) // 2
-                board = put(board, self.ROOK_W1 if j < i else self.ROOK_W2, ".")
-                board = put(board, kp, "R")
+        # Inversam coordonatele pentru negru
+        if board.turn == chess.BLACK:
+            from_rank = 7 - from_rank
+            from_file = 7 - from_file
+            to_rank = 7 - to_rank
+            to_file = 7 - to_file
         
-        # Mutari speciale pion
-        if p == "P":
-            if self.ROOK_B1 <= j <= self.ROOK_B2:
-                board = put(board, j, prom)
-            if j - i == 2 * self.UP:
-                ep = i + self.UP
-            if j == pos.ep:
-                board = put(board, j + self.DOWN, ".")
-        # Rotim pozitia pentru urmatorul jucator
-        return self.rotate(BoardState(board, score, white_castling, black_castling, ep, kp))
\ No newline at end of file
+        result = chess.Move(
+            chess.square(from_file, from_rank),
+            chess.square(to_file, to_rank),
+            promotion=chess.PIECE_SYMBOLS.index(move.prom.lower()) if move.prom else None
+        )
+        return result if result in board.legal_moves else None
+
+    def new_game(self):
+        #Uitam tot ce am invatat din partida anterioara (tabela, istoric, sesiune)
+        self.tt.clear()
+        self.history = [0] * (128 * 120)
+        self.killers = [[None, None] for _ in range(self.MAX_PLY)]
+        self.seen_positions = set()
+        self.session = GameSession(self)
+
+    def close(self):
+        #Oprim procesele ajutatoare si eliberam tabela partajata
+        if self.smp is not None:
+            self.smp.close()
+            self.smp = None
+        if isinstance(self.tt, SharedTranspositionTable):
+            self.tt.close()
+        if self.book is not None:
+            self.book.close()
+            self.book = None
+        if self.tablebase is not None:
+            self.tablebase.close()
+            self.tablebase = None
@@ -0,0 +1,179 @@
+import multiprocessing as mp
+import queue
+
+import chess
+
+from board import ChessBoard
+from chess_models.search_stats import CallbackListener
+
+
+def _worker_main(requests, events, stop_event, model_options, stockfish_level, ponder):
+    #Bucla procesului de motor: o cerere (job_id, motor, fen radacina, mutari) pe rand
+    from chess_models.chess_ai import ChessAI
+    from chess_models.ponder import Ponderer
+
+    ai, ponderer, stockfish = None, None, None
+    # Acelasi obiect de tabla intre cereri, ca sesiunea ChessAI sa aplice doar mutarile noi
+    board = ChessBoard()
+    current = [None]
+
+    def on_search_event(event, data):
+        # Progresul se trimite doar pentru cererea in curs. Pondering-ul ruleaza cu
+        # current[0] None, asa ca nu citeste tabla cat timp o schimbam pentru o cerere noua
+        if event == "depth" and current[0] is not None:
+            pv = ai.chess_principal_variation(board, EngineWorker.MAX_PV)
+            events.put(("progress", current[0], {"depth": data["depth"], "score": data["score"],
+                                                 "nodes": data["nodes"], "nps": data["nps"],
+                                                 "pv": [move.uci() for move in pv]}))
+
+    try:
+        while True:
+            job = requests.get()
+            if job is None:
+                break
+            job_id, engine, root_fen, moves = job
+            stop_event.clear()
+            board.board.set_fen(root_fen)
+            for move in moves:
+                board.board.push_uci(move)
+
+            if engine == "model":
+                if ai is None:
+                    ai = ChessAI(**model_options)
+                    ai.add_listener(CallbackListener(on_search_event))
+                    ponderer = Ponderer(ai) if ponder else None
+                time_manager = ai.default_time_manager()
+                time_manager.stop_event = stop_event
+                if ponderer is not None:
+                    # La ponder miss, cautarea din fundal se opreste inainte sa raportam progresul cererii
+                    ponderer.stop_unless(board.board.fen())
+                current[0] = job_id
+                try:
+                    if ponderer is not None:
+                        move = ponderer.get_best_move(board, time_manager)
+                    else:
+                        move = ai.get_best_move(board, time_manager)
+                finally:
+                    current[0] = None
+                events.put(("bestmove", job_id, move.uci() if move else None))
+
+                # Cautam raspunsul asteptat cat timp interfata asteapta adversarul
+                if ponderer is not None and move is not None and not stop_event.is_set():
+                    board.board.push(move)
+                    if not board.board.is_game_over():
+                        ponderer.start(board)
+            else:
+                # Pondering-ul modelului continua cat timp Stockfish cauta
+                if stockfish is None:
+                    from stockFishBot import StockfishBot
+                    stockfish = StockfishBot(level=stockfish_level)
+                move = stockfish.get_best_move(board)
+                events.put(("bestmove", job_id, move.uci() if move else None))
+    finally:
+        if ponderer is not None:
+            ponderer.stop()
+        if ai is not None:
+            ai.close()
+        if stockfish is not None:
+            from stockFishBot import EnginePool
+            EnginePool.close_shared()
+
+
+class EngineWorker:
+    # Motoarele (ChessAI si Stockfish) intr-un proces separat, ca interfata sa nu
+    # se blocheze in timpul cautarii. Cererile au un id; evenimentele unei cereri
+    # anulate sau inlocuite sunt ignorate. Daca procesul moare in timpul unei
+    # cereri, il repornim si retrimitem cererea (de cel mult MAX_RESTARTS ori).
+    MAX_PV = 8
+    MAX_RESTARTS = 3
+    STOP_TIMEOUT = 2.0
+
+    def __init__(self, model_options=None, stockfish_level=0, ponder=False):
+        self.model_options = dict(model_options or {})
+        self.stockfish_level = stockfish_level
+        self.ponder = ponder
+        self.context = mp.get_context()
+        self.process = None
+        self.requests = None
+        self.events = None
+        self.stop_event = None
+        self.next_id = 0
+        self.pending = None
+        self.restarts = 0
+
+    @property
+    def busy(self):
+        return self.pending is not None
+
+    def start(self):
+        #Pornim procesul (la prima cerere sau dupa o cadere)
+        self.requests = self.context.Queue()
+        self.events = self.context.Queue()
+        self.stop_event = self.context.Event()
+        self.process = self.context.Process(
+            target=_worker_main,
+            args=(self.requests, self.events, self.stop_event, self.model_options,
+                  self.stockfish_level, self.ponder),
+            daemon=True,
+        )
+        self.process.start()
+
+    def submit(self, engine, board: chess.Board):
+        #Cere mutarea lui engine ("model" sau "stockfish") pe board; intoarce id-ul cererii
+        if self.process is None or not self.process.is_alive():
+            self.start()
+        self.cancel()
+        self.next_id += 1
+        root = board.root()
+        self.pending = (self.next_id, engine, root.fen(), [move.uci() for move in board.move_stack])
+        self.requests.put(self.pending)
+        return self.next_id
+
+    def cancel(self):
+        #Oprim cautarea in curs; rezultatul ei nu mai este raportat
+        if self.pending is not None:
+            self.stop_event.set()
+            self.pending = None
+
+    def poll(self):
+        #Evenimentele sosite de la proces: (tip, job_id, date); tipuri progress, bestmove, restarted
+        result = []
+        while self.events is not None:
+            try:
+                kind, job_id, data = self.events.get_nowait()
+            except queue.Empty:
+                break
+            if self.pending is None or job_id != self.pending[0]:
+                continue
+            if kind == "bestmove":
+                self.pending = None
+                self.restarts = 0
+            result.append((kind, job_id, data))
+
+        if self.pending is not None and not self.process.is_alive():
+            result.append(self._restart())
+        return result
+
+    def _restart(self):
+        job = self.pending
+        exitcode = self.process.exitcode
+        if self.restarts >= self.MAX_RESTARTS:
+            self.pending = None
+            return "failed", job[0], exitcode
+        self.restarts += 1
+        self.start()
+        self.requests.put(job)
+        return "restarted", job[0], exitcode
+
+    def close(self):
+        #Oprim cautarea, pondering-ul si motoarele din proces
+        if self.process is None:
+            return
+        self.cancel()
+        self.stop_event.set()
+        if self.process.is_alive():
+            self.requests.put(None)
+            self.process.join(timeout=self.STOP_TIMEOUT)
+            if self.process.is_alive():
+                self.process.terminate()
+        self.process = None
@@ -0,0 +1,150 @@
+import multiprocessing as mp
+import queue
+import random
+import time
+
+from chess_models.time_manager import TimeManager
+
+
+def _helper_main(index, tt_name, hash_mb, backend, syzygy_path, jobs, done, stop_event):
+    #Bucla unui proces ajutator: cauta fiecare pozitie primita pana la stop_event
+    from chess_models.chess_ai import ChessAI
+    from chess_models.transposition_table import SharedTranspositionTable
+
+    ai = ChessAI(hash_mb=1, backend=backend, book=None, syzygy_path=syzygy_path)
+    ai.tt = SharedTranspositionTable(hash_mb, name=tt_name)
+    rng = random.Random(index)
+
+    while True:
+        job = jobs.get()
+        if job is None:
+            break
+        state, age, seen_positions = job
+        pos = ai.position_type(*state)
+        ai.tt.age = age
+        # Aceleasi pozitii de repetitie ca ale partidei, ca scorurile din tabela comuna sa coincida
+        ai.seen_positions = set(seen_positions)
+
+        # Zgomot mic in istoric: fiecare proces ordoneaza altfel mutarile linistite
+        ai.history = [h + rng.randrange(16) for h in ai.history]
+        time_manager = TimeManager(infinite=True, stop_event=stop_event)
+        try:
+            # Jumatate din procese incep cu o adancime mai sus
+            for _ in ai.search(pos, time_manager, start_depth=1 + index % 2):
+                pass
+        except TimeoutError:
+            pass
+        done.put(index)
+
+    ai.tt.close()
+
+
+class LazySMP:
+    # Procese ajutatoare care cauta aceeasi pozitie ca procesul principal si
+    # impart cu el tabela de transpozitie; rezultatul raportat este al celui principal.
+    STOP_TIMEOUT = 2.0
+
+    def __init__(self, ai, helpers):
+        self.ai = ai
+        self.helpers = helpers
+        self.context = mp.get_context()
+        self.stop_event = self.context.Event()
+        self.done = self.context.Queue()
+        self.jobs = []
+        self.processes = []
+        self.running = 0
+
+    def _ensure_started(self):
+        #Pornim procesele o singura data si le refolosim la fiecare mutare
+        if self.processes and all(p.is_alive() for p in self.processes):
+            return
+        self.close()
+        self.jobs = [self.context.Queue() for _ in range(self.helpers)]
+        for index, jobs in enumerate(self.jobs):
+            process = self.context.Process(
+                target=_helper_main,
+                args=(index, self.ai.tt.name, self.ai.tt.size_mb, self.ai.backend, self.ai.syzygy_path,
+                      jobs, self.done, self.stop_event),
+                daemon=True,
+            )
+            process.start()
+            self.processes.append(process)
+
+    def start(self, pos):
+        self._ensure_started()
+        self.stop_event.clear()
+        state = (bytes(pos.board), pos.score, pos.white_castling, pos.black_castling,
+                 pos.ep, pos.kp, pos.white)
+        seen_positions = frozenset(self.ai.seen_positions)
+        for jobs in self.jobs:
+            jobs.put((state, self.ai.tt.age, seen_positions))
+        self.running = len(self.jobs)
+
+    def stop(self):
+        #Oprim ajutoarele si asteptam sa confirme, ca urmatoarea pozitie sa porneasca curat
+        if not self.running:
+            return
+        self.stop_event.set()
+        for _ in range(self.running):
+            try:
+                self.done.get(timeout=self.STOP_TIMEOUT)
+            except queue.Empty:
+                break
+        self.stop_event.clear()
+        self.running = 0
+
+    def close(self):
+        self.stop()
+        for jobs in self.jobs:
+            jobs.put(None)
+        for process in self.processes:
+            process.join(timeout=self.STOP_TIMEOUT)
+            if process.is_alive():
+                process.terminate()
+        self.jobs, self.processes = [], []
+
+
+BENCH_FENS = [
+    "rnbqkbnr/pppppppp/8/8/8/8/PPPPPPPP/RNBQKBNR w KQkq - 0 1",
+    "r1bqkb1r/pppp1ppp/2n2n2/4p3/2B1P3/5N2/PPPP1PPP/RNBQK2R w KQkq - 4 4",
+    "r4rk1/1pp1qppp/p1np1n2/2b1p1B1/2B1P1b1/P1NP1N2/1PP1QPPP/R4RK1 w - - 0 10",
+    "8/2p5/3p4/KP5r/1R3p1k/8/4P1P1/8 w - - 0 1",
+]
+
+
+def scaling_benchmark(workers=(1, 2, 4, 8), depth=5, fens=BENCH_FENS, hash_mb=16):
+    #Timpul pana la adancimea data, pentru diferite numere de procese
+    from board import ChessBoard
+    from chess_models.chess_ai import ChessAI
+
+    results = {}
+    for threads in workers:
+        ai = ChessAI(hash_mb=hash_mb, threads=threads)
+        total = 0.0
+        try:
+            for fen in fens:
+                board = ChessBoard()
+                board.board.set_fen(fen)
+                pos = ai.position_from_board(board)
+                ai.tt.clear()
+                if ai.smp is not None:
+                    ai.smp.start(pos)
+                start = time.time()
+                try:
+                    for _ in ai.search(pos, TimeManager(depth=depth)):
+                        pass
+                finally:
+                    total += time.time() - start
+                    if ai.smp is not None:
+                        ai.smp.stop()
+        finally:
+            ai.close()
+        results[threads] = total
+        print(f"{threads} procese: {total:.2f}s pana la depth {depth} "
+              f"(accelerare {results[workers[0]] / total:.2f}x)")
+    return results
+
+
+if __name__ == "__main__":
+    # Rulare din radacina proiectului: python -m chess_models.lazy_smp
+    scaling_benchmark()
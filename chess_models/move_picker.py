@@ -0,0 +1,114 @@
+from chess_models.position import PAWN, KNIGHT, BISHOP, ROOK, QUEEN, KING, EMPTY
+
+# Rangul pieselor pentru MVV-LVA (victima cea mai valoroasa, atacatorul cel mai ieftin)
+PIECE_RANK = [0] * 128
+for _rank, _piece in enumerate((PAWN, KNIGHT, BISHOP, ROOK, QUEEN, KING), 1):
+    PIECE_RANK[_piece] = PIECE_RANK[_piece + 32] = _rank
+
+# Cate mutari linistite alegem una cate una inainte sa sortam restul
+LAZY_QUIETS = 3
+
+# Limita de valoare pentru mutarile din quiescence search
+QS_LIMIT = 150
+
+
+def is_quiet(pos, move):
+    #Mutare fara captura, promovare sau en passant
+    i, j, prom = move
+    if prom or pos.board[j] != EMPTY:
+        return False
+    return not (pos.board[i] == PAWN and (j == pos.ep or abs(j - pos.kp) < 2))
+
+
+def _pick_best(moves, scores):
+    #Selectie lenesa: scoatem mutarea cu scorul maxim fara sa sortam lista
+    best = max(range(len(moves)), key=scores.__getitem__)
+    moves[best], moves[-1] = moves[-1], moves[best]
+    scores[best], scores[-1] = scores[-1], scores[best]
+    return moves.pop(), scores.pop()
+
+
+class MovePicker:
+    # Genereaza mutarile in etape: mutarea din tabela de transpozitie, capturile dupa
+    # MVV-LVA, mutarile killer si apoi mutarile linistite dupa tabela de istoric.
+    # Fiecare mutare este evaluata o singura data cu ChessAI.value, iar valoarea se
+    # intoarce impreuna cu mutarea pentru Position.make_move.
+
+    def __init__(self, ai, pos, tt_move=None, killers=(), quiescence=False):
+        self.ai = ai
+        self.pos = pos
+        self.tt_move = tt_move
+        self.killers = killers
+        self.quiescence = quiescence
+        self.is_black = pos.is_black()
+
+    def __iter__(self):
+        if self.quiescence:
+            return self._quiescence_moves()
+        return self._staged_moves()
+
+    def _value(self, move):
+        return self.ai.value(self.pos, move, self.is_black)
+
+    def _quiescence_moves(self):
+        #Doar mutarile care castiga suficient (capturi, promovari), cea mai buna prima
+        moves, scores = [], []
+        for move in self.ai.gen_moves(self.pos):
+            value = self._value(move)
+            if value >= QS_LIMIT:
+                moves.append(move)
+                scores.append(value)
+        while moves:
+            yield _pick_best(moves, scores)
+
+    def _mvv_lva(self, move):
+        i, j, prom = move
+        board = self.pos.board
+        victim = PIECE_RANK[board[j]]
+        if board[i] == PAWN:
+            if abs(j - self.pos.kp) < 2:
+                victim = PIECE_RANK[KING]
+            elif j == self.pos.ep:
+                victim = PIECE_RANK[PAWN]
+        if prom:
+            victim += PIECE_RANK[ord(prom)]
+        return 8 * victim - PIECE_RANK[board[i]]
+
+    def _staged_moves(self):
+        pos, tt_move = self.pos, self.tt_move
+
+        # 1. Mutarea din tabela de transpozitie, inainte de a genera ceva
+        if tt_move is not None and 64 < pos.board[tt_move.i] < 91 and not 64 < pos.board[tt_move.j] < 91:
+            yield tt_move, self._value(tt_move)
+
+        # 2. Capturile si promovarile, dupa MVV-LVA
+        captures, capture_scores, quiets = [], [], []
+        for move in self.ai.gen_moves(pos):
+            if move == tt_move:
+                continue
+            if is_quiet(pos, move):
+                quiets.append(move)
+            else:
+                captures.append(move)
+                capture_scores.append(self._mvv_lva(move))
+        while captures:
+            move, _ = _pick_best(captures, capture_scores)
+            yield move, self._value(move)
+
+        # 3. Mutarile killer de la acelasi ply
+        for killer in self.killers:
+            if killer is not None and killer != tt_move and killer in quiets:
+                quiets.remove(killer)
+                yield killer, self._value(killer)
+
+        # 4. Mutarile linistite, dupa istoric si apoi dupa valoarea mutarii
+        history = self.ai.history
+        board = pos.board
+        values = [self._value(move) for move in quiets]
+        scores = [history[board[m.i] * 120 + m.j] + v for m, v in zip(quiets, values)]
+        for _ in range(min(LAZY_QUIETS, len(quiets))):
+            best = max(range(len(quiets)), key=scores.__getitem__)
+            yield quiets[best], values[best]
+            del quiets[best], values[best], scores[best]
+        for _, move, value in sorted(zip(scores, quiets, values), key=lambda x: x[0], reverse=True):
+            yield move, value
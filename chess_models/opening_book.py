@@ -0,0 +1,170 @@
+from collections import defaultdict, namedtuple
+import json
+import mmap
+import os
+import random
+import struct
+import sys
+
+import chess
+import chess.polyglot
+
+# O intrare Polyglot are 16 octeti: cheie (8), mutare (2), greutate (2), learn (4), big-endian
+ENTRY_STRUCT = struct.Struct('>QHHI')
+BookEntry = namedtuple('BookEntry', 'move weight')
+
+BASE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+DEFAULT_BOOK_PATH = os.path.join(BASE_DIR, "Utils", "book.bin")
+
+# Greutatea unei mutari dupa rezultatul partidei, din perspectiva celui care a mutat
+RESULT_WEIGHTS = {"win": 2, "draw": 1, "loss": 0}
+
+# Rocada in Polyglot: (rege, turn) -> patratul final al regelui
+CASTLING_TARGETS = {(chess.E1, chess.H1): chess.G1, (chess.E1, chess.A1): chess.C1,
+                    (chess.E8, chess.H8): chess.G8, (chess.E8, chess.A8): chess.C8}
+
+
+def _decode_move(board, raw):
+    #Mutarea Polyglot: to(6) | from(6) | promotie(3); rocada e codata ca regele ia turnul
+    to_square, from_square = raw & 0x3F, raw >> 6 & 0x3F
+    promotion = raw >> 12 & 0x7
+    if board.piece_type_at(from_square) == chess.KING and (from_square, to_square) in CASTLING_TARGETS:
+        return chess.Move(from_square, CASTLING_TARGETS[from_square, to_square])
+    return chess.Move(from_square, to_square, promotion=promotion + 1 if promotion else None)
+
+
+def _encode_move(board, move):
+    to_square = move.to_square
+    if board.is_castling(move):
+        # Regele "ia" turnul din coltul lui
+        to_square = chess.square(7 if chess.square_file(move.to_square) > 4 else 0,
+                                 chess.square_rank(move.from_square))
+    promotion = move.promotion - 1 if move.promotion else 0
+    return to_square | move.from_square << 6 | promotion << 12
+
+
+class OpeningBook:
+    # Carte de deschideri Polyglot citita prin mmap, cu cautare binara dupa cheie
+
+    def __init__(self, path, max_ply=20, rng=None):
+        self.path = path
+        self.max_ply = max_ply
+        self.rng = rng or random.Random()
+        self.file = open(path, 'rb')
+        size = os.path.getsize(path)
+        self.mmap = mmap.mmap(self.file.fileno(), 0, access=mmap.ACCESS_READ) if size else b''
+        self.count = size // ENTRY_STRUCT.size
+
+    @classmethod
+    def open(cls, path=DEFAULT_BOOK_PATH, **kwargs):
+        #Cartea, sau None daca fisierul nu exista
+        if path is None or not os.path.exists(path):
+            return None
+        return cls(path, **kwargs)
+
+    def _key_at(self, index):
+        return ENTRY_STRUCT.unpack_from(self.mmap, index * ENTRY_STRUCT.size)[0]
+
+    def _first_index(self, key):
+        #Prima intrare cu cheia >= key (intrarile sunt sortate dupa cheie)
+        lo, hi = 0, self.count
+        while lo < hi:
+            mid = (lo + hi) // 2
+            if self._key_at(mid) < key:
+                lo = mid + 1
+            else:
+                hi = mid
+        return lo
+
+    def find_all(self, board: chess.Board):
+        #Toate mutarile legale din carte pentru pozitie
+        if board.ply() >= self.max_ply:
+            return []
+        key = chess.polyglot.zobrist_hash(board)
+        entries = []
+        index = self._first_index(key)
+        while index < self.count:
+            entry_key, raw, weight, _ = ENTRY_STRUCT.unpack_from(self.mmap, index * ENTRY_STRUCT.size)
+            if entry_key != key:
+                break
+            move = _decode_move(board, raw)
+            if weight and move in board.legal_moves:
+                entries.append(BookEntry(move, weight))
+            index += 1
+        return entries
+
+    def pick(self, board: chess.Board, weighted=True):
+        #Alegem o mutare: aleator dupa greutate, sau cea mai grea
+        entries = self.find_all(board)
+        if not entries:
+            return None
+        if not weighted:
+            return max(entries, key=lambda e: e.weight).move
+        return self.rng.choices([e.move for e in entries], weights=[e.weight for e in entries])[0]
+
+    def close(self):
+        if self.mmap:
+            self.mmap.close()
+        self.file.close()
+
+
+def _game_result(game):
+    #Rezultatul pentru alb: 1, 0 sau 0.5 (None daca nu se cunoaste)
+    return {"1-0": 1, "0-1": 0, "1/2-1/2": 0.5}.get(game.get("scor"))
+
+
+def build_book(games, path, max_ply=20):
+    #Construieste o carte Polyglot din partidele salvate (formatul din Jocuri.json)
+    weights = defaultdict(int)
+    for game in games:
+        result = _game_result(game)
+        if result is None:
+            continue
+        board = chess.Board()
+        for uci in game.get("mutari", [])[:max_ply]:
+            try:
+                move = chess.Move.from_uci(uci)
+            except ValueError:
+                break
+            if move not in board.legal_moves:
+                break
+            mover_score = result if board.turn == chess.WHITE else 1 - result
+            outcome = "win" if mover_score == 1 else "loss" if mover_score == 0 else "draw"
+            if RESULT_WEIGHTS[outcome]:
+                weights[chess.polyglot.zobrist_hash(board), _encode_move(board, move)] += RESULT_WEIGHTS[outcome]
+            board.push(move)
+
+    # Greutatile trebuie sa incapa pe 16 biti
+    scale = max(weights.values(), default=1)
+    scale = max(1, -(-scale // 0xFFFF))
+    entries = sorted(((key, raw, max(1, weight // scale)) for (key, raw), weight in weights.items()),
+                     key=lambda e: (e[0], -e[2]))
+    with open(path, 'wb') as f:
+        for key, raw, weight in entries:
+            f.write(ENTRY_STRUCT.pack(key, raw, weight, 0))
+    return len(entries)
+
+
+def build_book_from_json(json_path, path=DEFAULT_BOOK_PATH, max_ply=20):
+    with open(json_path, "r") as f:
+        games = json.load(f)
+    return build_book(games, path, max_ply)
+
+
+def build_book_from_store(db_path=None, path=DEFAULT_BOOK_PATH, max_ply=20):
+    #Partidele sunt citite pe rand din baza de partide
+    from game_store import DEFAULT_DB_PATH, GameStore
+
+    with GameStore(db_path or DEFAULT_DB_PATH) as store:
+        return build_book(store.games(), path, max_ply)
+
+
+if __name__ == "__main__":
+    # python -m chess_models.opening_book [Jocuri.db | Jocuri.json] [book.bin]
+    source = sys.argv[1] if len(sys.argv) > 1 else None
+    target = sys.argv[2] if len(sys.argv) > 2 else DEFAULT_BOOK_PATH
+    if source is not None and source.endswith(".json"):
+        written = build_book_from_json(source, target)
+    else:
+        written = build_book_from_store(source, target)
+    print(f"{written} intrari scrise in {target}")
@@ -0,0 +1,221 @@
+import argparse
+import multiprocessing as mp
+import sys
+import time
+
+import chess
+
+from board import ChessBoard
+from chess_models.chess_ai import ChessAI
+from chess_models.position import PieceMove
+
+# Pozitiile standard de perft: (nume, FEN, numarul de noduri pe adancimi 1, 2, 3, ...)
+PERFT_POSITIONS = [
+    ("start", "rnbqkbnr/pppppppp/8/8/8/8/PPPPPPPP/RNBQKBNR w KQkq - 0 1",
+     (20, 400, 8902, 197281, 4865609)),
+    ("kiwipete", "r3k2r/p1ppqpb1/bn2pnp1/3PN3/1p2P3/2N2Q1p/PPPBBPPP/R3K2R w KQkq - 0 1",
+     (48, 2039, 97862, 4085603)),
+    ("position3", "8/2p5/3p4/KP5r/1R3p1k/8/4P1P1/8 w - - 0 1",
+     (14, 191, 2812, 43238, 674624)),
+    ("position4", "r3k2r/Pppp1ppp/1b3nbN/nP6/BBP1P3/q4N2/Pp1P2PP/R2Q1RK1 w kq - 0 1",
+     (6, 264, 9467, 422333)),
+    ("position4_mirrored", "r2q1rk1/pP1p2pp/Q4n2/bbp1p3/Np6/1B3NBn/pPPP1PPP/R3K2R b KQ - 0 1",
+     (6, 264, 9467, 422333)),
+    ("position5", "rnbq1k1r/pp1Pbppp/2p5/8/2B5/8/PPP1NnPP/RNBQK2R w KQ - 1 8",
+     (44, 1486, 62379, 2103487)),
+    ("position6", "r4rk1/1pp1qppp/p1np1n2/2b1p1B1/2B1P1b1/P1NP1N2/1PP1QPPP/R4RK1 w - - 0 10",
+     (46, 2079, 89890, 3894594)),
+]
+
+
+def position_from_fen(ai, fen):
+    board = ChessBoard()
+    board.board.set_fen(fen)
+    return board, ai.position_from_board(board)
+
+
+def is_illegal(ai, pos):
+    #Dupa make_move (adversarul la mutare): mutarea noastra e ilegala daca regele nostru
+    #e atacat, sau (la rocada) unul din patratele traversate de rege (pos.kp si vecinii)
+    pos.rotate()
+    kp = pos.kp
+    illegal = pos.in_check() or kp and any(pos.is_square_attacked(i) for i in (kp - 1, kp, kp + 1))
+    pos.rotate()
+    return illegal
+
+
+def legal_moves(ai, pos):
+    moves = []
+    for move in ai.gen_moves(pos):
+        pos.make_move(move, 0)
+        if not is_illegal(ai, pos):
+            moves.append(move)
+        pos.unmake_move()
+    return moves
+
+
+def perft(ai, pos, depth):
+    #Numarul de pozitii legale la adancimea data
+    if depth == 0:
+        return 1
+    nodes = 0
+    for move in ai.gen_moves(pos):
+        pos.make_move(move, 0)
+        if not is_illegal(ai, pos):
+            nodes += perft(ai, pos, depth - 1) if depth > 1 else 1
+        pos.unmake_move()
+    return nodes
+
+
+def divide(ai, board: chess.Board, pos, depth):
+    #Numarul de noduri sub fiecare mutare de la radacina, cu mutarile in UCI
+    result = {}
+    for move in legal_moves(ai, pos):
+        pos.make_move(move, 0)
+        result[ai.chess_move(board, move).uci()] = perft(ai, pos, depth - 1)
+        pos.unmake_move()
+    return result
+
+
+# Procesele pentru impartirea mutarilor de la radacina; fiecare isi face un ChessAI
+_worker_ai = None
+
+
+def _init_worker(backend):
+    global _worker_ai
+    _worker_ai = ChessAI(hash_mb=1, backend=backend, book=None)
+
+
+def _divide_job(job):
+    fen, move, depth = job
+    _, pos = position_from_fen(_worker_ai, fen)
+    pos.make_move(PieceMove(*move), 0)
+    return move, perft(_worker_ai, pos, depth - 1)
+
+
+def parallel_divide(fen, depth, backend='mailbox', jobs=None):
+    #Ca divide, dar mutarile de la radacina se impart intre procese
+    ai = ChessAI(hash_mb=1, backend=backend, book=None)
+    board, pos = position_from_fen(ai, fen)
+    moves = legal_moves(ai, pos)
+    with mp.get_context().Pool(jobs, initializer=_init_worker, initargs=(backend,)) as pool:
+        counts = dict(pool.map(_divide_job, [(fen, tuple(move), depth) for move in moves]))
+    return {ai.chess_move(board.board, PieceMove(*move)).uci(): counts[tuple(move)] for move in moves}
+
+
+def chess_perft(board: chess.Board, depth):
+    #Perft de referinta, cu generatorul din python-chess
+    if depth == 1:
+        return board.legal_moves.count()
+    nodes = 0
+    for move in board.legal_moves:
+        board.push(move)
+        nodes += chess_perft(board, depth - 1)
+        board.pop()
+    return nodes
+
+
+def chess_divide(board: chess.Board, depth):
+    result = {}
+    for move in board.legal_moves:
+        board.push(move)
+        result[move.uci()] = chess_perft(board, depth - 1) if depth > 1 else 1
+        board.pop()
+    return result
+
+
+def find_mismatch(ai, fen, depth):
+    #Coboram pe prima mutare cu numar diferit de noduri pana gasim pozitia gresita.
+    #Intoarce None daca totul coincide, altfel (mutari, fen, mutari lipsa, mutari in plus)
+    path = []
+    board = chess.Board(fen)
+    while depth >= 1:
+        _, pos = position_from_fen(ai, board.fen())
+        ours, reference = divide(ai, board, pos, depth), chess_divide(board, depth)
+        if ours == reference:
+            return None
+        missing, extra = set(reference) - set(ours), set(ours) - set(reference)
+        if missing or extra or depth == 1:
+            return path, board.fen(), sorted(missing), sorted(extra)
+        move = next(m for m in reference if reference[m] != ours[m])
+        path.append(move)
+        board.push_uci(move)
+        depth -= 1
+    return None
+
+
+def run_suite(depth, backend='mailbox', positions=PERFT_POSITIONS):
+    #Verifica pozitiile standard si masoara viteza generatorului
+    ai = ChessAI(hash_mb=1, backend=backend, book=None)
+    total_nodes, total_time, failures = 0, 0.0, 0
+    for name, fen, expected in positions:
+        if depth > len(expected):
+            continue
+        _, pos = position_from_fen(ai, fen)
+        start = time.time()
+        nodes = perft(ai, pos, depth)
+        elapsed = time.time() - start
+        total_nodes += nodes
+        total_time += elapsed
+        status = "ok" if nodes == expected[depth - 1] else f"GRESIT (asteptat {expected[depth - 1]})"
+        failures += nodes != expected[depth - 1]
+        print(f"{backend:<9} {name:<20} depth {depth}  {nodes:>9}  {elapsed:>7.2f}s  {status}")
+    rate = int(total_nodes / total_time) if total_time > 0 else 0
+    print(f"{backend:<9} total {total_nodes} noduri in {total_time:.2f}s ({rate} mutari/s)")
+    return failures
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Perft pentru ChessAI.gen_moves")
+    parser.add_argument("--depth", type=int, default=3)
+    parser.add_argument("--fen", help="o pozitie anume (implicit pozitiile standard)")
+    parser.add_argument("--backend", choices=ChessAI.BACKENDS + ('all',), default='all')
+    parser.add_argument("--divide", action="store_true", help="noduri pentru fiecare mutare de la radacina")
+    parser.add_argument("--jobs", type=int, default=1, help="procese pentru impartirea mutarilor")
+    parser.add_argument("--diff", action="store_true", help="compara cu python-chess si arata prima diferenta")
+    args = parser.parse_args(argv)
+    backends = ChessAI.BACKENDS if args.backend == 'all' else (args.backend,)
+
+    failures = 0
+    for backend in backends:
+        if args.diff:
+            ai = ChessAI(hash_mb=1, backend=backend, book=None)
+            fens = [args.fen] if args.fen else [fen for _, fen, _ in PERFT_POSITIONS]
+            for fen in fens:
+                mismatch = find_mismatch(ai, fen, args.depth)
+                if mismatch is None:
+                    print(f"{backend:<9} {fen}  identic cu python-chess la depth {args.depth}")
+                else:
+                    failures += 1
+                    path, bad_fen, missing, extra = mismatch
+                    print(f"{backend:<9} {fen}  diferenta dupa {' '.join(path) or '(radacina)'}: "
+                          f"{bad_fen}  lipsa {missing}  in plus {extra}")
+        elif args.divide:
+            fen = args.fen or PERFT_POSITIONS[0][1]
+            start = time.time()
+            if args.jobs > 1:
+                counts = parallel_divide(fen, args.depth, backend, args.jobs)
+            else:
+                ai = ChessAI(hash_mb=1, backend=backend, book=None)
+                board, pos = position_from_fen(ai, fen)
+                counts = divide(ai, board.board, pos, args.depth)
+            elapsed = time.time() - start
+            for move in sorted(counts):
+                print(f"{move}: {counts[move]}")
+            total = sum(counts.values())
+            print(f"{backend}: {total} noduri in {elapsed:.2f}s ({int(total / elapsed) if elapsed else 0} mutari/s)")
+        elif args.fen:
+            ai = ChessAI(hash_mb=1, backend=backend, book=None)
+            _, pos = position_from_fen(ai, args.fen)
+            start = time.time()
+            nodes = perft(ai, pos, args.depth)
+            elapsed = time.time() - start
+            print(f"{backend}: {nodes} noduri in {elapsed:.2f}s ({int(nodes / elapsed) if elapsed else 0} mutari/s)")
+        else:
+            failures += run_suite(args.depth, backend)
+    return 1 if failures else 0
+
+
+if __name__ == "__main__":
+    # Rulare din radacina proiectului: python -m chess_models.perft --depth 3 --diff
+    sys.exit(main())
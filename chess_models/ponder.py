@@ -0,0 +1,104 @@
+import copy
+import threading
+
+from board import ChessBoard
+
+
+class Ponderer:
+    # Cautare in fundal pe timpul adversarului. Dupa mutarea noastra presupunem
+    # raspunsul din tabela de transpozitie si cautam pozitia rezultata; daca
+    # adversarul joaca acel raspuns (ponder hit) cautarea continua cu limitele
+    # normale, altfel (ponder miss) o oprim si pastram doar tabela incalzita.
+
+    def __init__(self, ai):
+        self.ai = ai
+        self.thread = None
+        self.time_manager = None
+        self.ponder_fen = None
+        self.expected_move = None
+        self.best_move = None
+        self.hits = 0
+        self.misses = 0
+
+    @property
+    def active(self):
+        return self.thread is not None
+
+    def start(self, board: ChessBoard, time_manager=None):
+        #Porneste pondering-ul dupa ce motorul a mutat pe board
+        self.stop()
+        pos = self._position(board)
+        reply = self.ai.chess_move(board.board, self.ai.tt_move(pos))
+        if reply is None:
+            return False
+
+        # Tabla dupa raspunsul asteptat, separata de cea a interfetei
+        ponder_board = copy.copy(board)
+        ponder_board.board = board.board.copy()
+        ponder_board.board.push(reply)
+        if ponder_board.board.is_game_over():
+            return False
+        # Cartea de deschideri raspunde oricum instant
+        if self.ai.book is not None and self.ai.book.find_all(ponder_board.board):
+            return False
+
+        self.time_manager = time_manager or self.ai.default_time_manager()
+        self.time_manager.infinite = True
+        self.ponder_fen = ponder_board.board.fen()
+        self.expected_move = reply
+        self.best_move = None
+        pos = self._position(ponder_board)
+        self.thread = threading.Thread(target=self._run, args=(pos,), daemon=True)
+        self.thread.start()
+        return True
+
+    def _position(self, board: ChessBoard):
+        # Pornim din pozitia sesiunii, ca scorurile scrise in tabela de transpozitie
+        # sa fie pe aceeasi scara ca ale cautarii principale
+        pos = self.ai.session.position_for(board)
+        return pos if pos is not None else self.ai.position_from_board(board)
+
+    def _run(self, pos):
+        ai = self.ai
+        if ai.smp is not None:
+            ai.smp.start(pos)
+        try:
+            for depth, gamma, score, move in ai.search(pos, self.time_manager):
+                if move:
+                    self.best_move = move
+        except TimeoutError:
+            pass
+        finally:
+            if ai.smp is not None:
+                ai.smp.stop()
+
+    def stop(self):
+        #Ponder miss (sau inchidere): oprim cautarea, tabela de transpozitie ramane
+        if self.thread is None:
+            return
+        self.time_manager.stop()
+        self.thread.join()
+        self.thread = None
+
+    def stop_unless(self, fen):
+        #Ponder miss: oprim cautarea daca pozitia ceruta nu este cea asteptata
+        if self.thread is not None and fen != self.ponder_fen:
+            self.misses += 1
+            self.stop()
+
+    def get_best_move(self, board: ChessBoard, time_manager=None):
+        #Inlocuieste ChessAI.get_best_move cand pondering-ul este activ
+        if self.thread is not None and board.board.fen() == self.ponder_fen:
+            # Ponder hit: cautarea continua, ceasul mutarii porneste acum
+            self.hits += 1
+            if time_manager is not None and time_manager.stop_event is not None:
+                self.time_manager.stop_event = time_manager.stop_event
+            self.time_manager.ponderhit()
+            self.thread.join()
+            self.thread = None
+            move = self.ai.chess_move(board.board, self.best_move)
+            if move is not None:
+                return move
+        else:
+            self.stop_unless(board.board.fen())
+        return self.ai.get_best_move(board, time_manager)
@@ -0,0 +1,247 @@
+from collections import namedtuple
+from chess_models.transposition_table import ZOBRIST_PIECES, ZOBRIST_ROTATED, flip_square, zobrist_keys, zobrist_state
+
+PieceMove = namedtuple('PieceMove', 'i j prom')
+
+# Codurile pieselor in tabla 10x12 (bytearray): majuscule = jucatorul la mutare
+PAWN, KNIGHT, BISHOP, ROOK, QUEEN, KING = b'PNBRQK'
+EMPTY, OFF_BOARD = b'. '
+SWAPCASE = bytes.maketrans(b'PNBRQKpnbrqk', b'pnbrqkPNBRQK')
+
+# Indexare tablă 10x12
+ROOK_W1, ROOK_W2 = 91, 98
+ROOK_B1, ROOK_B2 = 21, 28
+UP, DOWN = -10, 10
+
+# Deplasarile pentru atacuri, de la patratul atacat spre atacator
+KNIGHT_OFFSETS = (-21, -19, -12, -8, 8, 12, 19, 21)
+KING_OFFSETS = (-11, -10, -9, -1, 1, 9, 10, 11)
+ORTHOGONAL = (-10, -1, 1, 10)
+DIAGONAL = (-11, -9, 9, 11)
+
+# Valorile pieselor (folosite si de ChessAI pentru evaluare)
+PIECE_WEIGHTS = {"P": 102, "N": 285, "B": 322, "R": 482, "Q": 932, "K": 62000}
+
+# Material, material fara pioni si faza jocului, indexate dupa codul piesei;
+# MATERIAL numara doar majusculele (jucatorul tablei), RMATERIAL doar literele mici
+MATERIAL, RMATERIAL = [0] * 128, [0] * 128
+NON_PAWN, RNON_PAWN = [0] * 128, [0] * 128
+PHASE = [0] * 128
+for _piece in 'PNBRQ':
+    MATERIAL[ord(_piece)] = RMATERIAL[ord(_piece.lower())] = PIECE_WEIGHTS[_piece]
+for _piece in 'NBRQ':
+    NON_PAWN[ord(_piece)] = RNON_PAWN[ord(_piece.lower())] = PIECE_WEIGHTS[_piece]
+for _piece, _phase in zip('NBRQ', (1, 1, 2, 4)):
+    PHASE[ord(_piece)] = PHASE[ord(_piece.lower())] = _phase
+
+# Faza la inceputul partidei (toate piesele pe tabla); 0 = final doar cu pioni
+MAX_PHASE = 24
+
+# Cheile Zobrist indexate dupa codul piesei
+_NO_KEYS = (0,) * 120
+_KEYS = [ZOBRIST_PIECES.get(chr(c), _NO_KEYS) for c in range(128)]
+_RKEYS = [ZOBRIST_ROTATED.get(chr(c), _NO_KEYS) for c in range(128)]
+
+
+class Position:
+    # Pozitie mutabila: tabla din perspectiva jucatorului la mutare si tabla rotita,
+    # tinute in paralel ca rotirea sa fie doar un schimb de referinte. Regele, materialul
+    # si materialul fara pioni sunt tinute la fel, cate unul pentru fiecare tabla
+    # (king/rking = patratul lui K in board/rboard, -1 daca lipseste).
+    __slots__ = ('board', 'rboard', 'score', 'white_castling', 'black_castling',
+                 'ep', 'kp', 'key', 'rkey', 'white', 'history',
+                 'king', 'rking', 'material', 'rmaterial', 'non_pawn', 'rnon_pawn', 'phase')
+
+    def __init__(self, board, score=0, white_castling=(True, True), black_castling=(True, True),
+                 ep=0, kp=0, white=True):
+        self.board = bytearray(board, 'ascii') if isinstance(board, str) else bytearray(board)
+        self.rboard = self.board[::-1].translate(SWAPCASE)
+        self.score = score
+        self.white_castling = white_castling
+        self.black_castling = black_castling
+        self.ep = ep
+        self.kp = kp
+        self.white = white
+        self.key, self.rkey = zobrist_keys(self.board.decode('ascii'), white_castling, black_castling, ep, kp)
+        self.history = []
+
+        self.king = self.board.find(KING)
+        self.rking = self.rboard.find(KING)
+        self.material = sum(MATERIAL[p] for p in self.board)
+        self.rmaterial = sum(RMATERIAL[p] for p in self.board)
+        self.non_pawn = sum(NON_PAWN[p] for p in self.board)
+        self.rnon_pawn = sum(RNON_PAWN[p] for p in self.board)
+        self.phase = sum(PHASE[p] for p in self.board)
+
+    def copy(self):
+        pos = type(self).__new__(type(self))
+        pos.board, pos.rboard = bytearray(self.board), bytearray(self.rboard)
+        pos.score, pos.ep, pos.kp, pos.white = self.score, self.ep, self.kp, self.white
+        pos.white_castling, pos.black_castling = self.white_castling, self.black_castling
+        pos.key, pos.rkey = self.key, self.rkey
+        pos.king, pos.rking = self.king, self.rking
+        pos.material, pos.rmaterial = self.material, self.rmaterial
+        pos.non_pawn, pos.rnon_pawn = self.non_pawn, self.rnon_pawn
+        pos.phase = self.phase
+        pos.history = []
+        return pos
+
+    def __str__(self):
+        return self.board.decode('ascii')
+
+    def _update_state(self, i, q, p):
+        #Piesa q de pe patratul i este inlocuita cu p: regi, material si faza
+        self.material += MATERIAL[p] - MATERIAL[q]
+        self.rmaterial += RMATERIAL[p] - RMATERIAL[q]
+        if PHASE[p] or PHASE[q]:
+            self.non_pawn += NON_PAWN[p] - NON_PAWN[q]
+            self.rnon_pawn += RNON_PAWN[p] - RNON_PAWN[q]
+            self.phase += PHASE[p] - PHASE[q]
+        if p == KING:
+            self.king = i
+        elif p == KING + 32:
+            self.rking = 119 - i
+        elif q == KING and self.king == i:
+            self.king = -1
+        elif q == KING + 32 and self.rking == 119 - i:
+            self.rking = -1
+
+    def _put(self, i, p):
+        #Pune piesa p pe patratul i in ambele table si actualizeaza cheile
+        q = self.board[i]
+        self.key ^= _KEYS[q][i] ^ _KEYS[p][i]
+        self.rkey ^= _RKEYS[q][i] ^ _RKEYS[p][i]
+        self._update_state(i, q, p)
+        self.board[i] = p
+        self.rboard[119 - i] = SWAPCASE[p]
+
+    def _set(self, i, p):
+        #Ca _put, fara chei (folosit la unmake, cheile se restaureaza din istoric)
+        self._update_state(i, self.board[i], p)
+        self.board[i] = p
+        self.rboard[119 - i] = SWAPCASE[p]
+
+    def _clear_state_keys(self):
+        self.key ^= zobrist_state(self.white_castling, self.black_castling, self.ep, self.kp)
+        self.rkey ^= zobrist_state(self.black_castling, self.white_castling,
+                                   flip_square(self.ep), flip_square(self.kp))
+
+    def rotate(self):
+        #roteste pozitia pentru a vedea perspectiva celuilalt jucator
+        self.board, self.rboard = self.rboard, self.board
+        self.key, self.rkey = self.rkey, self.key
+        self.king, self.rking = self.rking, self.king
+        self.material, self.rmaterial = self.rmaterial, self.material
+        self.non_pawn, self.rnon_pawn = self.rnon_pawn, self.non_pawn
+        self.white_castling, self.black_castling = self.black_castling, self.white_castling
+        self.ep, self.kp = flip_square(self.ep), flip_square(self.kp)
+        self.score = -self.score
+        self.white = not self.white
+
+    def is_black(self):
+        #Testul folosit de evaluare: regele adversarului este mai jos pe tabla decat al nostru
+        #(acelasi rezultat ca board.find(b'k') > board.find(b'K'), fara sa parcurgem tabla)
+        return (119 - self.rking if self.rking >= 0 else -1) > self.king
+
+    def is_square_attacked(self, i):
+        #Patratul i este atacat de o piesa a adversarului (literele mici)?
+        board = self.board
+        # Pionii adversarului coboara, deci ataca i de pe i - 11 si i - 9
+        if board[i - 11] == PAWN + 32 or board[i - 9] == PAWN + 32:
+            return True
+        for d in KNIGHT_OFFSETS:
+            if board[i + d] == KNIGHT + 32:
+                return True
+        for d in KING_OFFSETS:
+            if board[i + d] == KING + 32:
+                return True
+        # Razele inverse: prima piesa intalnita trebuie sa gliseze in acea directie
+        for directions, slider in ((ORTHOGONAL, ROOK + 32), (DIAGONAL, BISHOP + 32)):
+            for d in directions:
+                j = i + d
+                while board[j] == EMPTY:
+                    j += d
+                if board[j] == slider or board[j] == QUEEN + 32:
+                    return True
+        return False
+
+    def in_check(self):
+        #Regele jucatorului la mutare este atacat (sau a fost deja capturat)
+        return self.king < 0 or self.is_square_attacked(self.king)
+
+    def make_move(self, move, delta):
+        #Executam mutarea pe loc; delta este valoarea mutarii calculata de ChessAI.value
+        i, j, prom = move
+        board = self.board
+        p, q = board[i], board[j]
+        ep = self.ep
+        self.history.append((move, q, self.score, self.white_castling, self.black_castling,
+                             ep, self.kp, self.key, self.rkey))
+        self._clear_state_keys()
+        white_castling, black_castling, self.ep, self.kp = self.white_castling, self.black_castling, 0, 0
+
+        self._put(j, p)
+        self._put(i, EMPTY)
+
+        # Actualizam drepturile de rocada
+        if i == ROOK_W1: white_castling = (False, white_castling[1])
+        if i == ROOK_W2: white_castling = (white_castling[0], False)
+        if j == ROOK_B1: black_castling = (black_castling[0], False)
+        if j == ROOK_B2: black_castling = (False, black_castling[1])
+
+        # Rocada
+        if p == KING:
+            white_castling = (False, False)
+            if abs(j - i) == 2:
+                self.kp = (i + j) // 2
+                self._put(ROOK_W1 if j < i else ROOK_W2, EMPTY)
+                self._put(self.kp, ROOK)
+
+        # Mutari speciale pion
+        if p == PAWN:
+            if ROOK_B1 <= j <= ROOK_B2:
+                self._put(j, ord(prom))
+            if j - i == 2 * UP:
+                self.ep = i + UP
+            if j == ep:
+                self._put(j + DOWN, EMPTY)
+
+        self.white_castling, self.black_castling = white_castling, black_castling
+        self._clear_state_keys()
+        self.score += delta
+        self.rotate()
+
+    def unmake_move(self):
+        #Anulam ultima mutare facuta cu make_move
+        self.rotate()
+        (i, j, prom), q, self.score, self.white_castling, self.black_castling, \
+            self.ep, self.kp, self.key, self.rkey = self.history.pop()
+        p = PAWN if prom else self.board[j]
+        self._set(i, p)
+        self._set(j, q)
+        if p == KING and abs(j - i) == 2:
+            self._set((i + j) // 2, EMPTY)
+            self._set(ROOK_W1 if j < i else ROOK_W2, ROOK)
+        if p == PAWN and j == self.ep:
+            self._set(j + DOWN, PAWN + 32)
+
+    def clear_king_passant(self):
+        #Dupa o rocada jucata in partida (deci legala) nu mai are rost captura regelui
+        if self.kp:
+            self._clear_state_keys()
+            self.kp = 0
+            self._clear_state_keys()
+
+    def make_null(self):
+        #Mutare nula: doar dam randul adversarului
+        self.history.append((None, 0, self.score, self.white_castling, self.black_castling,
+                             self.ep, self.kp, self.key, self.rkey))
+        self._clear_state_keys()
+        self.ep = self.kp = 0
+        self._clear_state_keys()
+        self.rotate()
+
+    def unmake_null(self):
+        self.rotate()
+        (_, _, self.score, self.white_castling, self.black_castling,
+         self.ep, self.kp, self.key, self.rkey) = self.history.pop()
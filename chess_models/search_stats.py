@@ -0,0 +1,111 @@
+import json
+import logging
+import time
+
+
+class SearchStats:
+    # Contoarele unei cautari; bound le incrementeaza direct, restul se calculeaza la cerere
+    __slots__ = ('nodes', 'qnodes', 'tt_probes', 'tt_hits', 'tt_cutoffs', 'beta_cutoffs',
+                 'first_move_cutoffs', 'tb_probes', 'tb_hits', 'depths', 'start_time', 'end_time')
+
+    def __init__(self):
+        self.reset()
+
+    def reset(self):
+        self.nodes = 0
+        self.qnodes = 0
+        self.tt_probes = 0
+        self.tt_hits = 0
+        self.tt_cutoffs = 0
+        self.beta_cutoffs = 0
+        self.first_move_cutoffs = 0
+        self.tb_probes = 0
+        self.tb_hits = 0
+        # (depth, secunde, noduri) pentru fiecare adancime terminata
+        self.depths = []
+        self.start_time = time.time()
+        self.end_time = None
+
+    def elapsed(self):
+        return (self.end_time or time.time()) - self.start_time
+
+    def nps(self):
+        elapsed = self.elapsed()
+        return int(self.nodes / elapsed) if elapsed > 0 else 0
+
+    def first_move_cutoff_rate(self):
+        #Cat de des taietura beta vine de la prima mutare incercata (calitatea ordonarii)
+        return self.first_move_cutoffs / self.beta_cutoffs if self.beta_cutoffs else 0.0
+
+    def tt_hit_rate(self):
+        return self.tt_hits / self.tt_probes if self.tt_probes else 0.0
+
+    def tb_hit_rate(self):
+        return self.tb_hits / self.tb_probes if self.tb_probes else 0.0
+
+    def branching_factor(self):
+        #Factorul de ramificare efectiv: media geometrica a cresterii nodurilor pe adancime
+        depths = [(depth, nodes) for depth, _, nodes in self.depths if nodes]
+        if len(depths) < 2:
+            return 0.0
+        (first_depth, first_nodes), (last_depth, last_nodes) = depths[0], depths[-1]
+        return (last_nodes / first_nodes) ** (1 / (last_depth - first_depth))
+
+    def as_dict(self):
+        return {
+            "nodes": self.nodes,
+            "qnodes": self.qnodes,
+            "time": round(self.elapsed(), 4),
+            "nps": self.nps(),
+            "tt_probes": self.tt_probes,
+            "tt_hits": self.tt_hits,
+            "tt_cutoffs": self.tt_cutoffs,
+            "beta_cutoffs": self.beta_cutoffs,
+            "first_move_cutoff_rate": round(self.first_move_cutoff_rate(), 4),
+            "branching_factor": round(self.branching_factor(), 3),
+            "tb_probes": self.tb_probes,
+            "tb_hits": self.tb_hits,
+            "depths": [{"depth": depth, "time": round(seconds, 4), "nodes": nodes}
+                       for depth, seconds, nodes in self.depths],
+        }
+
+
+class SearchListener:
+    # Primeste evenimentele cautarii: "iteration", "depth", "stop", "bestmove"
+    def on_event(self, event, data):
+        pass
+
+    def close(self):
+        pass
+
+
+class CallbackListener(SearchListener):
+    def __init__(self, callback):
+        self.callback = callback
+
+    def on_event(self, event, data):
+        self.callback(event, data)
+
+
+class LoggingListener(SearchListener):
+    def __init__(self, logger=None, level=logging.INFO):
+        self.logger = logger or logging.getLogger("chess_models.search")
+        self.level = level
+
+    def on_event(self, event, data):
+        if self.logger.isEnabledFor(self.level):
+            fields = " ".join(f"{key}={value}" for key, value in data.items() if key != "depths")
+            self.logger.log(self.level, "%s %s", event, fields)
+
+
+class JsonLinesListener(SearchListener):
+    # Un obiect JSON pe linie, usor de citit de scripturi
+    def __init__(self, path):
+        self.file = open(path, "a")
+
+    def on_event(self, event, data):
+        self.file.write(json.dumps({"event": event, "timestamp": time.time(), **data}) + "\n")
+        self.file.flush()
+
+    def close(self):
+        self.file.close()
@@ -0,0 +1,125 @@
+import copy
+
+from board import ChessBoard
+
+
+class GameSession:
+    # Pozitia interna a unei partii, pastrata intre mutari. La fiecare apel
+    # aplicam doar mutarile noi din board.move_stack (sau le anulam, la undo),
+    # in loc sa reconstruim pozitia cu convert_board_format.
+    MAX_PV = 16
+
+    def __init__(self, ai):
+        self.ai = ai
+        self.board = None
+        self.root_fen = None
+        self.moves = []
+        self.keys = []
+        self.pos = None
+        self.pv = []
+
+    def _rewind(self, length):
+        #Anulam mutarile ramase pe pozitie (ex. cautare oprita de TimeoutError)
+        pos = self.pos
+        while len(pos.history) > length:
+            if pos.history[-1][0] is None:
+                pos.unmake_null()
+            else:
+                pos.unmake_move()
+
+    def _rebuild(self, board: ChessBoard):
+        #Pornim de la pozitia initiala a partiei si rejucam toate mutarile
+        root = copy.copy(board)
+        root.board = board.board.root()
+        self.board = board.board
+        self.root_fen = root.board.fen()
+        self.pos = self.ai.position_from_board(root)
+        self.moves, self.keys, self.pv = [], [self.pos.key], []
+
+    def _push(self, chess_board, move):
+        #Aplicam o mutare a partidei; chess_board este tabla inainte de mutare
+        ai, pos = self.ai, self.pos
+        internal = ai.internal_move(chess_board, move)
+        pos.make_move(internal, ai.value(pos, internal))
+        pos.clear_king_passant()
+        self.moves.append(move)
+        self.keys.append(pos.key)
+
+        # Varianta principala ramane valabila doar cat partida o urmeaza
+        self.pv = self.pv[1:] if self.pv and self.pv[0] == internal else []
+
+    def sync(self, board: ChessBoard):
+        #Aducem pozitia la zi cu board si o intoarcem
+        chess_board = board.board
+        if self.pos is None or chess_board is not self.board or chess_board.root().fen() != self.root_fen:
+            self._rebuild(board)
+        self._rewind(len(self.moves))
+
+        # Lungimea prefixului comun cu mutarile deja aplicate
+        stack = chess_board.move_stack
+        common = 0
+        for ours, theirs in zip(self.moves, stack):
+            if ours != theirs:
+                break
+            common += 1
+
+        # Anulam mutarile retrase din partida
+        if common < len(self.moves):
+            self._rewind(common)
+            del self.moves[common:], self.keys[common + 1:]
+            self.pv = []
+
+        # Aplicam mutarile noi pe o copie a tablei, ca sa stim cine muta
+        if common < len(stack):
+            replay = chess_board.copy()
+            for _ in range(len(stack) - common):
+                replay.pop()
+            for move in stack[common:]:
+                self._push(replay, move)
+                replay.push(move)
+
+        self.ai.seen_positions = set(self.keys)
+        self._seed_pv()
+        return self.pos
+
+    def position_for(self, board: ChessBoard):
+        #O copie a pozitiei partidei, dusa pana la board cu mutarile care urmeaza, pe
+        #aceeasi scara a scorului ca pozitia sesiunii (ex. pentru pondering);
+        #None daca board nu continua partida sesiunii
+        chess_board = board.board
+        stack = chess_board.move_stack
+        if (self.pos is None or chess_board.root().fen() != self.root_fen
+                or stack[:len(self.moves)] != self.moves):
+            return None
+        self._rewind(len(self.moves))
+        ai, pos = self.ai, self.pos.copy()
+        extra = stack[len(self.moves):]
+        replay = chess_board.copy()
+        for _ in extra:
+            replay.pop()
+        for move in extra:
+            internal = ai.internal_move(replay, move)
+            pos.make_move(internal, ai.value(pos, internal))
+            pos.clear_king_passant()
+            replay.push(move)
+        return pos
+
+    def _seed_pv(self):
+        #Mutarile ramase din varianta principala anterioara intra in tabela de
+        #transpozitie, ca iterative deepening sa le incerce primele
+        ai, pos = self.ai, self.pos
+        made = 0
+        for move in self.pv:
+            if move not in set(ai.gen_moves(pos)):
+                break
+            if ai.tt_move(pos) is None:
+                ai.tt.store(pos.key, -ai.tt.DEPTH_OFFSET, -ai.CHECKMATE_UPPER, ai.CHECKMATE_UPPER, move)
+            pos.make_move(move, ai.value(pos, move))
+            made += 1
+        for _ in range(made):
+            pos.unmake_move()
+
+    def finish(self):
+        #Dupa cautare: refacem pozitia radacinii si retinem varianta principala
+        self._rewind(len(self.moves))
+        self.pv = self.ai.principal_variation(self.pos, self.MAX_PV)
@@ -0,0 +1,99 @@
+import os
+
+import chess
+import chess.syzygy
+
+from chess_models.position import EMPTY, OFF_BOARD
+
+
+def count_pieces(board):
+    #Numarul de piese de pe tabla 10x12 (inclusiv regii)
+    return len(board) - board.count(EMPTY) - board.count(OFF_BOARD)
+
+
+def to_chess_board(pos):
+    #Pozitia interna (relativa la jucatorul la mutare) ca tabla python-chess absoluta
+    board = chess.Board(None)
+    board.turn = chess.WHITE if pos.white else chess.BLACK
+    for i, p in enumerate(pos.board):
+        if p == EMPTY or p == OFF_BOARD:
+            continue
+        sq = i if pos.white else 119 - i
+        color = (p < 91) == pos.white
+        piece_type = chess.PIECE_SYMBOLS.index(chr(p).lower())
+        board.set_piece_at(chess.square(sq % 10 - 1, 9 - sq // 10), chess.Piece(piece_type, color))
+    if pos.ep:
+        sq = pos.ep if pos.white else 119 - pos.ep
+        board.ep_square = chess.square(sq % 10 - 1, 9 - sq // 10)
+    return board
+
+
+class Tablebase:
+    # Tabele Syzygy locale: WDL in cautare, DTZ la radacina
+
+    def __init__(self, path):
+        self.path = path
+        self.tables = chess.syzygy.Tablebase()
+        for directory in path.split(os.pathsep):
+            if os.path.isdir(directory):
+                self.tables.add_directory(directory)
+
+        # Cele mai multe piese dintr-o tabela incarcata ("KQvK" -> 3)
+        self.max_pieces = max((len(name) - 1 for name in self.tables.wdl), default=0)
+        self.probes = 0
+        self.hits = 0
+
+    @classmethod
+    def open(cls, path):
+        #Tabelele, sau None daca directorul nu exista / nu contine tabele
+        if not path:
+            return None
+        tablebase = cls(path)
+        if not tablebase.max_pieces:
+            tablebase.close()
+            return None
+        return tablebase
+
+    def reset_stats(self):
+        self.probes = 0
+        self.hits = 0
+
+    def probe_wdl(self, pos):
+        #WDL pentru jucatorul la mutare (-2..2), sau None daca pozitia nu e in tabele
+        if count_pieces(pos.board) > self.max_pieces:
+            return None
+        # Tabelele nu contin pozitii cu drept de rocada
+        if any(pos.white_castling) or any(pos.black_castling) or pos.kp:
+            return None
+        self.probes += 1
+        wdl = self.tables.get_wdl(to_chess_board(pos))
+        if wdl is not None:
+            self.hits += 1
+        return wdl
+
+    def root_move(self, board: chess.Board):
+        #Mutarea optima dupa DTZ: castigam cat mai repede, pierdem cat mai tarziu
+        if board.castling_rights or len(board.piece_map()) > self.max_pieces:
+            return None
+        best_move, best_key = None, None
+        for move in board.legal_moves:
+            board.push(move)
+            try:
+                if board.is_checkmate():
+                    key = (3, 0)
+                else:
+                    self.probes += 1
+                    wdl, dtz = self.tables.get_wdl(board), self.tables.get_dtz(board)
+                    if wdl is None or dtz is None:
+                        return None
+                    self.hits += 1
+                    # Scorurile sunt ale adversarului, dupa mutarea noastra
+                    key = (-wdl, -abs(dtz) if wdl < 0 else abs(dtz))
+            finally:
+                board.pop()
+            if best_key is None or key > best_key:
+                best_move, best_key = move, key
+        return best_move
+
+    def close(self):
+        self.tables.close()
@@ -0,0 +1,82 @@
+import time
+
+
+class TimeManager:
+    # Cate noduri trec intre doua verificari ale ceasului (putere a lui 2)
+    CHECK_INTERVAL = 256
+
+    # Mutari ramase presupuse cand nu stim movestogo
+    DEFAULT_MOVES_TO_GO = 30
+
+    # Cat din buget folosim inainte sa nu mai pornim o iteratie noua
+    SOFT_RATIO = 0.6
+
+    # Cat de mult poate depasi o mutare bugetul normal, ca multiplu
+    HARD_RATIO = 3.0
+
+    # Rezerva pentru latenta interfetei / protocolului (secunde)
+    OVERHEAD = 0.05
+
+    def __init__(self, remaining=None, increment=0.0, moves_to_go=None,
+                 movetime=None, nodes=None, depth=None, infinite=False, stop_event=None):
+        self.remaining = remaining
+        self.increment = increment
+        self.moves_to_go = moves_to_go
+        self.movetime = movetime
+        self.nodes = nodes
+        self.depth = depth
+        self.start_time = None
+        self.soft_limit = None
+        self.hard_limit = None
+        self.stopped = False
+        self.infinite = infinite
+
+        # Eveniment partajat intre procese (Lazy SMP), verificat impreuna cu stopped
+        self.stop_event = stop_event
+
+    def start(self):
+        #Impartim timpul pentru mutarea curenta in limita soft si hard
+        # stopped nu se reseteaza: un stop venit inainte de pornirea cautarii ramane valabil
+        self.start_time = time.time()
+        if self.movetime is not None:
+            self.hard_limit = max(0.01, self.movetime - self.OVERHEAD)
+            self.soft_limit = self.hard_limit * self.SOFT_RATIO
+        elif self.remaining is not None:
+            moves_to_go = self.moves_to_go or self.DEFAULT_MOVES_TO_GO
+            usable = max(0.01, self.remaining - self.OVERHEAD)
+            budget = usable / moves_to_go + self.increment * 0.75
+            self.hard_limit = max(0.01, min(budget * self.HARD_RATIO, usable * 0.5))
+            self.soft_limit = min(budget, self.hard_limit) * self.SOFT_RATIO
+        else:
+            self.soft_limit = self.hard_limit = None
+
+    def elapsed(self):
+        return time.time() - self.start_time
+
+    def stop(self):
+        #Oprire ceruta din afara (ex. interfata, protocol)
+        self.stopped = True
+
+    def ponderhit(self):
+        #Adversarul a jucat mutarea asteptata: ceasul porneste acum, cu limitele normale
+        self.infinite = False
+        self.start()
+
+    def check(self, nodes):
+        #Apelat din bound la fiecare CHECK_INTERVAL noduri; opreste cautarea daca e cazul
+        if self.stopped or self.stop_event is not None and self.stop_event.is_set():
+            raise TimeoutError("Cautare oprita")
+        if self.nodes is not None and nodes >= self.nodes:
+            raise TimeoutError("Limita de noduri atinsa")
+        if not self.infinite and self.hard_limit is not None and self.elapsed() >= self.hard_limit:
+            raise TimeoutError("Limita de timp atinsa")
+
+    def should_stop(self, depth=None, nodes=0):
+        #Verificare intre iteratii: nu mai pornim una noua daca am trecut de limita soft
+        if self.stopped or self.stop_event is not None and self.stop_event.is_set():
+            return True
+        if self.depth is not None and depth is not None and depth >= self.depth:
+            return True
+        if self.nodes is not None and nodes >= self.nodes:
+            return True
+        return not self.infinite and self.soft_limit is not None and self.elapsed() >= self.soft_limit
@@ -0,0 +1,181 @@
+from collections import namedtuple
+from multiprocessing import shared_memory
+import random
+
+# Intrare citita din tabela de transpozitie
+TTEntry = namedtuple('TTEntry', 'depth lower upper move')
+
+# Chei Zobrist pe 64 biti, generate determinist pentru tabla 10x12
+_rng = random.Random(0x5EED_C4E55)
+_rand64 = lambda: _rng.getrandbits(64)
+
+ZOBRIST_PIECES = {p: tuple(_rand64() for _ in range(120)) for p in 'PNBRQKpnbrqk'}
+ZOBRIST_PIECES['.'] = ZOBRIST_PIECES[' '] = (0,) * 120
+
+# Aceleasi chei vazute din perspectiva celuilalt jucator (tabla rotita)
+ZOBRIST_ROTATED = {p: tuple(ZOBRIST_PIECES[p.swapcase()][119 - i] for i in range(120))
+                   for p in ZOBRIST_PIECES}
+
+# Drepturi de rocada (noi, adversar), en passant si king passant
+ZOBRIST_CASTLING = {(wc, bc): _rand64()
+                    for wc in ((False, False), (False, True), (True, False), (True, True))
+                    for bc in ((False, False), (False, True), (True, False), (True, True))}
+ZOBRIST_EP = (0,) + tuple(_rand64() for _ in range(1, 120))
+ZOBRIST_KP = (0,) + tuple(_rand64() for _ in range(1, 120))
+
+
+def flip_square(sq):
+    #Patratul vazut de celalalt jucator (0 ramane 0)
+    return 119 - sq if sq else 0
+
+
+def zobrist_state(white_castling, black_castling, ep, kp):
+    #Partea cheii care nu tine de piese
+    return ZOBRIST_CASTLING[white_castling, black_castling] ^ ZOBRIST_EP[ep] ^ ZOBRIST_KP[kp]
+
+
+def zobrist_keys(board, white_castling, black_castling, ep, kp):
+    #Calculeaza de la zero cheia pozitiei si cheia pozitiei rotite
+    key = zobrist_state(white_castling, black_castling, ep, kp)
+    rkey = zobrist_state(black_castling, white_castling, flip_square(ep), flip_square(kp))
+    for i, p in enumerate(board):
+        key ^= ZOBRIST_PIECES[p][i]
+        rkey ^= ZOBRIST_ROTATED[p][i]
+    return key, rkey
+
+
+class TranspositionTable:
+    # Fiecare intrare ocupa doua cuvinte de 64 biti: cheia XOR datele, si datele impachetate.
+    # O intrare scrisa pe jumatate de alt proces nu mai verifica XOR-ul si este ignorata.
+    BUCKET_SIZE = 4
+    ENTRY_BYTES = 16
+
+    # Impachetarea datelor: mutare(17) | depth(7) | varsta(4) | lower(18) | upper(18)
+    PROMOTIONS = ('', 'N', 'B', 'R', 'Q')
+    DEPTH_OFFSET = 64
+    SCORE_OFFSET = 1 << 17
+    AGE_MASK = 15
+
+    def __init__(self, size_mb=16):
+        self.resize(size_mb)
+
+    def _buckets(self, size_mb):
+        #Un numar de bucket-uri putere a lui 2 care incape in bugetul dat
+        buckets = max(1, int(size_mb * 1024 * 1024) // (self.ENTRY_BYTES * self.BUCKET_SIZE))
+        return 1 << (buckets.bit_length() - 1)
+
+    def resize(self, size_mb):
+        buckets = self._buckets(size_mb)
+        self.size_mb = size_mb
+        self.mask = buckets - 1
+        self.table = memoryview(bytearray(buckets * self.BUCKET_SIZE * self.ENTRY_BYTES)).cast('Q')
+        self.age = 0
+
+    def clear(self):
+        self.table[:] = memoryview(bytes(self.table.nbytes)).cast('Q')
+        self.age = 0
+
+    def new_search(self):
+        #Intrarile cautarilor vechi devin candidate la inlocuire
+        self.age = (self.age + 1) & self.AGE_MASK
+
+    def _pack_move(self, move):
+        if move is None:
+            return 0
+        return move.i | move.j << 7 | self.PROMOTIONS.index(move.prom) << 14
+
+    def _unpack_move(self, data):
+        if not data & 0x1FFFF:
+            return None
+        return (data & 0x7F, data >> 7 & 0x7F, self.PROMOTIONS[data >> 14 & 7])
+
+    def probe(self, key):
+        #Cautam pozitia in bucket-ul ei
+        table = self.table
+        base = (key & self.mask) * self.BUCKET_SIZE * 2
+        for slot in range(base, base + self.BUCKET_SIZE * 2, 2):
+            data = table[slot + 1]
+            if table[slot] ^ data == key:
+                if not data:
+                    return None
+                return TTEntry(
+                    (data >> 17 & 0x7F) - self.DEPTH_OFFSET,
+                    (data >> 28 & 0x3FFFF) - self.SCORE_OFFSET,
+                    (data >> 46) - self.SCORE_OFFSET,
+                    self._unpack_move(data),
+                )
+        return None
+
+    def store(self, key, depth, lower, upper, move=None):
+        #Scriem intrarea, inlocuind dupa adancime si varsta
+        table = self.table
+        base = (key & self.mask) * self.BUCKET_SIZE * 2
+        victim, victim_score = base, None
+        for slot in range(base, base + self.BUCKET_SIZE * 2, 2):
+            data = table[slot + 1]
+            if table[slot] ^ data == key or not data:
+                victim = slot
+                break
+            entry_depth = (data >> 17 & 0x7F) - self.DEPTH_OFFSET
+            entry_age = (self.age - (data >> 24)) & self.AGE_MASK
+            score = entry_depth - 8 * entry_age
+            if victim_score is None or score < victim_score:
+                victim, victim_score = slot, score
+
+        # Pastram mutarea veche daca nu avem una noua pentru aceeasi pozitie
+        packed_move = self._pack_move(move)
+        old_data = table[victim + 1]
+        if not packed_move and table[victim] ^ old_data == key:
+            packed_move = old_data & 0x1FFFF
+
+        depth = max(-self.DEPTH_OFFSET, min(self.DEPTH_OFFSET - 1, depth))
+        data = (packed_move
+                | (depth + self.DEPTH_OFFSET) << 17
+                | (self.age & self.AGE_MASK) << 24
+                | (lower + self.SCORE_OFFSET) << 28
+                | (upper + self.SCORE_OFFSET) << 46)
+        table[victim + 1] = data
+        table[victim] = key ^ data
+
+    def hashfull(self):
+        #Procentul (la mie) de intrari folosite in cautarea curenta, din primele 1000
+        sample = min(1000, len(self.table) // 2)
+        used = sum(1 for n in range(sample)
+                   if self.table[2 * n + 1] and (self.table[2 * n + 1] >> 24 & self.AGE_MASK) == self.age)
+        return used * 1000 // sample
+
+
+class SharedTranspositionTable(TranspositionTable):
+    # Aceeasi tabela, dar in memorie partajata intre procese (Lazy SMP).
+    # Procesul care o creeaza o si sterge; ceilalti se ataseaza dupa nume.
+
+    def __init__(self, size_mb=16, name=None):
+        self.name = name
+        self.owner = name is None
+        self.shm = None
+        super().__init__(size_mb)
+
+    def resize(self, size_mb):
+        self.close()
+        buckets = self._buckets(size_mb)
+        nbytes = buckets * self.BUCKET_SIZE * self.ENTRY_BYTES
+        if self.owner:
+            self.shm = shared_memory.SharedMemory(create=True, size=nbytes)
+            self.shm.buf[:nbytes] = bytes(nbytes)
+            self.name = self.shm.name
+        else:
+            self.shm = shared_memory.SharedMemory(name=self.name)
+        self.size_mb = size_mb
+        self.mask = buckets - 1
+        self.table = self.shm.buf[:nbytes].cast('Q')
+        self.age = 0
+
+    def close(self):
+        #Eliberam memoria partajata (o stergem doar daca noi am creat-o)
+        if self.shm is None:
+            return
+        self.table.release()
+        self.shm.close()
+        if self.owner:
+            self.shm.unlink()
+        self.shm = None
@@ -2,11 +2,68 @@ from PyQt6.QtWidgets import QWidget, QMessageBox, QDialog, QVBoxLayout, QPushBut
 from PyQt6.QtGui import QPainter, QColor, QPixmap, QIcon
 from PyQt6.QtCore import Qt, QRectF, QPointF, QSize, pyqtSignal
 from PyQt6.QtSvg import QSvgRenderer
+from collections import OrderedDict
 import chess
 import os
 from board import ChessBoard
 from promotion_dialog import PromotionDialog  
 
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))  # folder_UI/
+PIECE_DIR = os.path.normpath(os.path.join(BASE_DIR, "..", "Utils", "Chess_pieces"))
+
+
+class PieceAtlas:
+    # Piesele rasterizate o singura data pentru fiecare (marime, device pixel ratio),
+    # comune tuturor tablelor din aplicatie. La redimensionare se construieste
+    # lazy un set nou; pastram doar ultimele MAX_SIZES seturi.
+    MAX_SIZES = 4
+
+    _shared = None
+
+    def __init__(self, piece_dir=PIECE_DIR, piece_types=None):
+        self.renderers = {}
+        for piece, name in (piece_types or ChessBoardWidget.PIECE_TYPES).items():
+            self.renderers[piece.upper()] = QSvgRenderer(os.path.join(piece_dir, f"w_{name}_svg_NoShadow.svg"))
+            self.renderers[piece] = QSvgRenderer(os.path.join(piece_dir, f"b_{name}_svg_NoShadow.svg"))
+        self.pixmaps = OrderedDict()
+
+    @classmethod
+    def shared(cls):
+        #Atlasul comun al procesului (creat la prima tabla, dupa QApplication)
+        if cls._shared is None:
+            cls._shared = cls()
+        return cls._shared
+
+    def __contains__(self, piece):
+        return piece in self.renderers
+
+    def pixmaps_for(self, size, ratio=1.0):
+        #Toate piesele la marimea size (pixeli logici)
+        key = (size, ratio)
+        pixmaps = self.pixmaps.get(key)
+        if pixmaps is None:
+            pixmaps = {piece: self._rasterize(renderer, size, ratio) for piece, renderer in self.renderers.items()}
+            self.pixmaps[key] = pixmaps
+            while len(self.pixmaps) > self.MAX_SIZES:
+                self.pixmaps.popitem(last=False)
+        else:
+            self.pixmaps.move_to_end(key)
+        return pixmaps
+
+    def _rasterize(self, renderer, size, ratio):
+        # Desenam in pixeli fizici, ca piesele sa ramana clare pe ecrane HiDPI
+        pixels = max(1, round(size * ratio))
+        pixmap = QPixmap(pixels, pixels)
+        pixmap.fill(Qt.GlobalColor.transparent)
+        painter = QPainter(pixmap)
+        painter.setRenderHint(QPainter.RenderHint.Antialiasing)
+        painter.setRenderHint(QPainter.RenderHint.SmoothPixmapTransform)
+        renderer.render(painter, QRectF(0, 0, pixels, pixels))
+        painter.end()
+        pixmap.setDevicePixelRatio(ratio)
+        return pixmap
+
+
 class ChessBoardWidget(QWidget):
     move_made = pyqtSignal()
     
@@ -53,15 +110,8 @@ class ChessBoardWidget(QWidget):
         self.setMinimumSize(400, 400)
     
     def load_pieces(self):
-        self.pieces = {}
-        BASE_DIR = os.path.dirname(os.path.abspath(__file__))  # folder_UI/
-        PIECE_DIR = os.path.normpath(os.path.join(BASE_DIR, "..", "Utils", "Chess_pieces"))
-        for piece, name in self.PIECE_TYPES.items():
-            white_path = os.path.join(PIECE_DIR, f"w_{name}_svg_NoShadow.svg")
-            black_path = os.path.join(PIECE_DIR, f"b_{name}_svg_NoShadow.svg")
-
-            self.pieces[piece.upper()] = QSvgRenderer(white_path)
-            self.pieces[piece] = QSvgRenderer(black_path)
+        # SVG-urile se incarca si se rasterizeaza o singura data pentru toate tablele
+        self.pieces = PieceAtlas.shared()
     
     def get_initial_position(self):
         #Convertim pozitia din python-chess in reprezentarea noastra + inverseaza daca este cazul
@@ -100,14 +150,13 @@ class ChessBoardWidget(QWidget):
     def calculate_possible_moves(self, from_square):
         #Calculam toate mutarile posibile pentru o piesa
         moves = []
-        for move in self.board.board.legal_moves:
-            if chess.square_name(move.from_square) == from_square:
-                to_square = chess.square_name(move.to_square)
-                file_idx = self.files.index(to_square[0])
-                rank_idx = self.ranks.index(to_square[1])
-                
-                display_row = 7 - rank_idx if not self.reversed_board else rank_idx
-                display_col = file_idx if not self.reversed_board else 7 - file_idx
+        for move in self.board.state.moves_by_square.get(chess.parse_square(from_square), []):
+            file_idx = chess.square_file(move.to_square)
+            rank_idx = chess.square_rank(move.to_square)
+            
+            display_row = 7 - rank_idx if not self.reversed_board else rank_idx
+            display_col = file_idx if not self.reversed_board else 7 - file_idx
+            if (display_row, display_col) not in moves:
                 moves.append((display_row, display_col))
         return moves
     
@@ -157,7 +206,7 @@ class ChessBoardWidget(QWidget):
         else:
             move = chess.Move.from_uci(from_square + to_square)
         
-        if move and move in self.board.board.legal_moves:
+        if move and self.board.state.is_legal(move):
             self._execute_move(move)
     
     def _handle_promotion(self, from_square, to_square, is_white):
@@ -209,12 +258,13 @@ class ChessBoardWidget(QWidget):
     
     def _check_game_end(self):
         #Verifica daca s a terminat + afiseaza mesaj+ apeleaza salvarea
-        if self.board.board.is_checkmate():
+        state = self.board.state
+        if state.is_checkmate:
             winner = "Negru" if self.board.board.turn else "Alb"
             QMessageBox.information(self, "Șah Mat!", f"Jocul s-a terminat! {winner} a câștigat!")
             if hasattr(self.parent(), 'game_manager'):
                 self.parent().game_manager.save_game()
-        elif self.board.board.is_stalemate():
+        elif state.is_stalemate:
             QMessageBox.information(self, "Remiză!", "Jocul s-a terminat! Este pat!")
             if hasattr(self.parent(), 'game_manager'):
                 self.parent().game_manager.save_game()
@@ -232,6 +282,19 @@ class ChessBoardWidget(QWidget):
     
     def draw_board(self, painter, square_size):
         #Deseneaza Tabla de Sah
+        # Pătrățelul regelui în șah (din starea calculată o singură dată pe poziție)
+        check_square = None
+        king_square = self.board.state.checked_king
+        if king_square is not None:
+            king_file = chess.square_file(king_square)
+            king_rank = chess.square_rank(king_square)
+            
+            # Convertim coordonatele pentru afișare
+            if not self.reversed_board:
+                check_square = (7 - king_rank, king_file)
+            else:
+                check_square = (king_rank, 7 - king_file)
+        
         for row in range(8):
             for col in range(8):
                 x = col * square_size
@@ -240,23 +303,8 @@ class ChessBoardWidget(QWidget):
                 # Culoarea normală a pătrățelului
                 color = self.SQUARE_COLORS["light"] if (row + col) % 2 == 0 else self.SQUARE_COLORS["dark"]
                 
-                # Verificăm dacă regele este în șah și colorăm pătrățelul
-                if self.board.board.is_check():
-                    king_color = self.board.board.turn  # True pentru alb, False pentru negru
-                    king_square = self.board.board.king(king_color)
-                    king_file = chess.square_file(king_square)
-                    king_rank = chess.square_rank(king_square)
-                    
-                    # Convertim coordonatele pentru afișare
-                    if not self.reversed_board:
-                        display_row = 7 - king_rank
-                        display_col = king_file
-                    else:
-                        display_row = king_rank
-                        display_col = 7 - king_file
-                    
-                    if row == display_row and col == display_col:
-                        color = self.SQUARE_COLORS["check"]  # Roșu pentru șah
+                if (row, col) == check_square:
+                    color = self.SQUARE_COLORS["check"]  # Roșu pentru șah
                 
                 painter.fillRect(x, y, square_size, square_size, color)
     
@@ -276,18 +324,21 @@ class ChessBoardWidget(QWidget):
     
     def draw_pieces(self, painter, square_size):
         #Pozitia Initiala a pieselor
+        pixmaps = self.pieces.pixmaps_for(int(square_size * self.PIECE_SCALE), self.devicePixelRatioF())
         for row in range(8):
             for col in range(8):
                 piece = self.initial_position[row][col]
                 if piece != '.':
                     x = col * square_size
                     y = row * square_size
-                    self.draw_piece(painter, piece, x, y, square_size)
+                    self.draw_piece(painter, piece, x, y, square_size, pixmaps)
     
-    def draw_piece(self, painter, piece, x, y, size):
+    def draw_piece(self, painter, piece, x, y, size, pixmaps=None):
         #Deseneaza o piesa
         if piece in self.pieces:
             piece_size = int(size * self.PIECE_SCALE)
+            if pixmaps is None:
+                pixmaps = self.pieces.pixmaps_for(piece_size, self.devicePixelRatioF())
             x_offset = (size - piece_size) // 2
             y_offset = (size - piece_size) // 2
             
@@ -297,8 +348,7 @@ class ChessBoardWidget(QWidget):
                (x // size) == self.selected_piece[1]:
                 y_offset -= self.HOVER_OFFSET
             
-            rect = QRectF(x + x_offset, y + y_offset, piece_size, piece_size)
-            self.pieces[piece].render(painter, rect)
+            painter.drawPixmap(x + x_offset, y + y_offset, pixmaps[piece])
     
     def update_visual_board(self, old_board, new_board):
         #Actualizeaza Reprezentarea Vizuala a Tablei
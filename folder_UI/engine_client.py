@@ -0,0 +1,52 @@
+from PyQt6.QtCore import QObject, QTimer, pyqtSignal
+from chess_models.engine_worker import EngineWorker
+import chess
+
+
+class EngineClient(QObject):
+    # Interfata Qt peste EngineWorker: cererile pleaca spre procesul de motor,
+    # iar rezultatele sunt citite periodic (QTimer) si transmise ca semnale
+    progress = pyqtSignal(int, dict)
+    move_ready = pyqtSignal(int, object)
+    restarted = pyqtSignal(int, object)
+    failed = pyqtSignal(int, object)
+
+    POLL_INTERVAL = 30  # ms
+
+    def __init__(self, model_options=None, stockfish_level=0, ponder=False, parent=None):
+        super().__init__(parent)
+        self.worker = EngineWorker(model_options, stockfish_level, ponder)
+        self.timer = QTimer(self)
+        self.timer.setInterval(self.POLL_INTERVAL)
+        self.timer.timeout.connect(self._poll)
+
+    @property
+    def busy(self):
+        return self.worker.busy
+
+    def request_move(self, engine, board: chess.Board):
+        #Porneste cautarea; mutarea vine prin move_ready(job_id, chess.Move)
+        job_id = self.worker.submit(engine, board)
+        self.timer.start()
+        return job_id
+
+    def cancel(self):
+        self.worker.cancel()
+        self.timer.stop()
+
+    def _poll(self):
+        for kind, job_id, data in self.worker.poll():
+            if kind == "progress":
+                self.progress.emit(job_id, data)
+            elif kind == "bestmove":
+                self.move_ready.emit(job_id, chess.Move.from_uci(data) if data else None)
+            elif kind == "restarted":
+                self.restarted.emit(job_id, data)
+            else:
+                self.failed.emit(job_id, data)
+        if not self.worker.busy:
+            self.timer.stop()
+
+    def close(self):
+        self.timer.stop()
+        self.worker.close()
@@ -1,9 +1,65 @@
 from PyQt6.QtWidgets import QWidget
 from PyQt6.QtGui import QPainter, QColor, QLinearGradient, QPen, QFont
-from PyQt6.QtCore import Qt, QRectF
+from PyQt6.QtCore import Qt, QRectF, QThread, pyqtSignal
+from collections import OrderedDict
 from stockFishBot import StockfishBot
+from board import ChessBoard
+import threading
 import math
 
+
+class EvaluationCache:
+    # Evaluarile (din perspectiva albului) dupa FEN, cu eliminarea celei mai vechi folosite (LRU)
+    def __init__(self, max_size):
+        self.max_size = max_size
+        self.entries = OrderedDict()
+        self.lock = threading.Lock()
+
+    def get(self, fen):
+        with self.lock:
+            value = self.entries.get(fen)
+            if value is not None:
+                self.entries.move_to_end(fen)
+            return value
+
+    def put(self, fen, value):
+        with self.lock:
+            self.entries[fen] = value
+            self.entries.move_to_end(fen)
+            while len(self.entries) > self.max_size:
+                self.entries.popitem(last=False)
+
+    def __contains__(self, fen):
+        with self.lock:
+            return fen in self.entries
+
+
+class EvaluationPrefetcher(QThread):
+    # Evalueaza in fundal toate pozitiile unei partide; pozitia afisata are prioritate
+    evaluated = pyqtSignal(str, int)
+
+    def __init__(self, bar, fens, parent=None):
+        super().__init__(parent)
+        self.bar = bar
+        self.fens = fens
+        self.priority = None
+
+    def prioritize(self, fen):
+        self.priority = fen
+
+    def _next_fen(self):
+        priority = self.priority
+        if priority is not None and priority not in self.bar.cache:
+            return priority
+        return next((fen for fen in self.fens if fen not in self.bar.cache), None)
+
+    def run(self):
+        while not self.isInterruptionRequested():
+            fen = self._next_fen()
+            if fen is None:
+                break
+            self.evaluated.emit(fen, self.bar.analyse(fen))
+
 class EvaluationBarWidget(QWidget):
     # Constante
     COLORS = {
@@ -17,6 +73,7 @@ class EvaluationBarWidget(QWidget):
     BAR_WIDTH = 30
     SIGMOID_FACTOR = 400  # Factor normalizare evaluare
     BORDER_WIDTH = 1
+    CACHE_SIZE = 4096  # Pozitii pastrate in cache
     
     def __init__(self, parent=None):
         super().__init__(parent)
@@ -25,11 +82,71 @@ class EvaluationBarWidget(QWidget):
         self.stockfish = StockfishBot(level=20)
         self.font = QFont("Arial", 8, QFont.Weight.Bold)
         
-    def update_evaluation(self, board):
+        self.cache = EvaluationCache(self.CACHE_SIZE)
+        self.prefetcher = None
+        self.fen = None
+    
+    def analyse(self, fen):
+        #Evaluarea pozitiei (din perspectiva albului), din cache sau cu Stockfish
+        value = self.cache.get(fen)
+        if value is not None:
+            return value
+        board = ChessBoard()
+        board.board.set_fen(fen)
+        # Fiecare analiza imprumuta propriul motor din pool, deci firul de fundal nu o anuleaza pe a interfetei
         eval = self.stockfish.get_evaluation(board) or 0
-        self.evaluation = -eval if not board.board.turn else eval
+        value = -eval if not board.board.turn else eval
+        self.cache.put(fen, value)
+        return value
+    
+    def prefetch(self, fens):
+        #Porneste evaluarea in fundal a pozitiilor unei partide (plus pozitia afisata, prima)
+        self.stop_prefetch()
+        self.prefetcher = EvaluationPrefetcher(self, fens, self)
+        self.prefetcher.evaluated.connect(self._on_prefetched)
+        self.prefetcher.finished.connect(self._on_prefetch_finished)
+        self.prefetcher.finished.connect(self.prefetcher.deleteLater)
+        self.prefetcher.prioritize(self.fen)
+        self.prefetcher.start()
+    
+    def stop_prefetch(self):
+        # Nu asteptam firul (ar bloca interfata pana termina analiza in curs): ii taiem
+        # semnalele si il lasam sa se opreasca singur, apoi se sterge prin deleteLater
+        if self.prefetcher is not None:
+            prefetcher, self.prefetcher = self.prefetcher, None
+            prefetcher.evaluated.disconnect(self._on_prefetched)
+            prefetcher.finished.disconnect(self._on_prefetch_finished)
+            prefetcher.requestInterruption()
+    
+    def _on_prefetched(self, fen, value):
+        if fen == self.fen:
+            self.set_evaluation(value)
+    
+    def _on_prefetch_finished(self):
+        # Un fir inlocuit poate avea semnalul deja pus in coada inainte de deconectare
+        if self.sender() is not self.prefetcher:
+            return
+        self.prefetcher = None
+        # Pozitia ceruta chiar cand firul se termina nu a mai fost evaluata de el
+        if self.fen is not None and self.fen not in self.cache:
+            self.prefetch([])
+    
+    def set_evaluation(self, value):
+        self.evaluation = value
         self.update()
     
+    def update_evaluation(self, board):
+        self.fen = board.state.fen
+        value = self.cache.get(self.fen)
+        if value is not None:
+            self.set_evaluation(value)
+        elif self.prefetcher is not None and self.prefetcher.isRunning():
+            # Rezultatul vine prin _on_prefetched, fara sa blocam interfata
+            self.prefetcher.prioritize(self.fen)
+        else:
+            # Niciun fir activ: unul nou doar pentru pozitia afisata
+            self.prefetch([])
+    
     def _normalize_evaluation(self):
         return 2 / (1 + math.exp(-self.evaluation/self.SIGMOID_FACTOR)) - 1
     
@@ -82,5 +199,8 @@ class EvaluationBarWidget(QWidget):
         painter.drawText(text_rect, Qt.AlignmentFlag.AlignCenter, eval_text)
     
     def cleanup(self):
-        #Inchidem Stockfish
-        self.stockfish.close() 
\ No newline at end of file
+        #Oprim toate firele de evaluare (si cele inlocuite, inca in curs); motoarele raman in pool
+        self.stop_prefetch()
+        for prefetcher in self.findChildren(EvaluationPrefetcher):
+            prefetcher.requestInterruption()
+            prefetcher.wait() 
\ No newline at end of file
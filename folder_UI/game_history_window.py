@@ -1,9 +1,9 @@
 from PyQt6.QtWidgets import (QMainWindow, QWidget, QVBoxLayout, QHBoxLayout, 
-                           QPushButton, QListWidget, QListWidgetItem, QMessageBox)
+                           QPushButton, QListWidget, QListWidgetItem, QMessageBox, QSlider)
 from PyQt6.QtCore import Qt
 from chess_board_widget import ChessBoardWidget
-from board import ChessBoard
-import json
+from board import PositionIndex
+from game_store import GameStore
 from evaluation_bar_widget import EvaluationBarWidget
 
 class GameHistoryWindow(QMainWindow):
@@ -14,6 +14,8 @@ class GameHistoryWindow(QMainWindow):
         
         self.current_game_moves = []
         self.current_move_index = -1
+        self.position_index = PositionIndex()
+        self.store = GameStore()
         
         self._setup_ui()
         self._setup_button_style()
@@ -82,7 +84,13 @@ class GameHistoryWindow(QMainWindow):
         self.chess_board.setMinimumSize(600, 600)
         self.eval_bar = EvaluationBarWidget()
         
+        # Cursor pentru saltul direct la orice mutare a partidei
+        self.ply_slider = QSlider(Qt.Orientation.Horizontal)
+        self.ply_slider.setRange(-1, -1)
+        self.ply_slider.valueChanged.connect(self.go_to_move)
+        
         board_layout.addWidget(self.chess_board)
+        board_layout.addWidget(self.ply_slider)
         board_layout.addWidget(self.eval_bar)
         
         return board_layout
@@ -107,72 +115,63 @@ class GameHistoryWindow(QMainWindow):
         for btn in [self.start_btn, self.prev_btn, self.next_btn, self.end_btn]:
             btn.setStyleSheet(button_style)
     
-    def _update_board_position(self, move):
-        #Actualizarea tabelei.
-        if move in [m.uci() for m in self.chess_board.board.board.legal_moves]:
-            old_board = str(self.chess_board.board.board)
-            self.chess_board.board.make_move(move, self.chess_board.board.current_player)
-            new_board = str(self.chess_board.board.board)
-            self.chess_board.initial_position = self.chess_board.get_initial_position()
-            self.chess_board.update_visual_board(old_board, new_board)
-    
     def load_games(self):
-        #Incarcam in Json
-        try:
-            with open("Jocuri.json", "r") as f:
-                games = json.load(f)
-                for game in games:
-                    item_text = (f"{game.get('game_mode', 'Joc necunoscut')}\n"
-                               f"{game.get('castigator', 'necunoscut')} a câștigat\n"
-                               f"Jucat la: {game.get('timestamp', 'Data necunoscută')}")
-                    
-                    item = QListWidgetItem(item_text)
-                    item.setData(Qt.ItemDataRole.UserRole, game)
-                    self.games_list.addItem(item)
-        except (FileNotFoundError, json.JSONDecodeError):
+        #Incarcam din baza de partide; mutarile se citesc doar la deschiderea unei partide
+        for game in self.store.games(moves=False):
+            item_text = (f"{game.get('game_mode') or 'Joc necunoscut'}\n"
+                       f"{game.get('castigator') or 'necunoscut'} a câștigat\n"
+                       f"Jucat la: {game.get('timestamp') or 'Data necunoscută'}")
+            
+            item = QListWidgetItem(item_text)
+            item.setData(Qt.ItemDataRole.UserRole, game["id"])
+            self.games_list.addItem(item)
+        if self.games_list.count() == 0:
             print("Nu s-au găsit jocuri salvate")
     
     def load_game(self, item):
         #Incarca un joc din LV
         self.delete_btn.setEnabled(True)
-        game_data = item.data(Qt.ItemDataRole.UserRole)
-        self.current_game_moves = game_data["mutari"]
+        game_data = self.store.get(item.data(Qt.ItemDataRole.UserRole))
+        
+        # Pozitia dupa fiecare mutare, calculata o singura data: orice salt costa O(1)
+        self.position_index = PositionIndex(game_data["mutari"] if game_data else [])
+        self.current_game_moves = [move.uci() for move in self.position_index.moves]
         self.current_move_index = -1
+        self.ply_slider.blockSignals(True)
+        self.ply_slider.setRange(-1, len(self.current_game_moves) - 1)
+        self.ply_slider.blockSignals(False)
+        
+        # Evaluam in fundal toate pozitiile partidei, ca navigarea sa fie instantanee
+        self.eval_bar.prefetch(list(self.position_index.fens()))
         self.go_to_start()
     
+    def _render(self):
+        #Redesenam tabla si evaluarea o singura data, dupa ce pozitia e gata
+        self.chess_board.update()
+        self.eval_bar.update_evaluation(self.chess_board.board)
+        self.update_controls()
+    
+    def go_to_move(self, index):
+        #Afiseaza pozitia dupa mutarea index (-1 = pozitia de start), direct din index
+        index = max(-1, min(index, len(self.current_game_moves) - 1))
+        self.current_move_index = index
+        self.chess_board.board.board.set_fen(self.position_index.fen_at(index + 1))
+        self.chess_board.initial_position = self.chess_board.get_initial_position()
+        self._render()
+    
     def next_move(self):
         if self.current_move_index + 1 < len(self.current_game_moves):
-            self.current_move_index += 1
-            move = self.current_game_moves[self.current_move_index]
-            self._update_board_position(move)
-            self.chess_board.update()
-            self.eval_bar.update_evaluation(self.chess_board.board)
-            self.update_controls()
+            self.go_to_move(self.current_move_index + 1)
     
     def prev_move(self):
         if self.current_move_index >= 0:
-            self.chess_board.board = ChessBoard()
-            self.chess_board.initial_position = self.chess_board.get_initial_position()
-            self.current_move_index -= 1
-            
-            for i in range(self.current_move_index + 1):
-                self._update_board_position(self.current_game_moves[i])
-            
-            self.chess_board.update()
-            self.eval_bar.update_evaluation(self.chess_board.board)
-            self.update_controls()
+            self.go_to_move(self.current_move_index - 1)
     
     def go_to_start(self):
-        self.chess_board.board = ChessBoard()
-        self.chess_board.initial_position = self.chess_board.get_initial_position()
-        self.current_move_index = -1
-        self.chess_board.update()
-        self.update_controls()
+        self.go_to_move(-1)
     
     def go_to_end(self):
-        self.go_to_start()
-        for _ in range(len(self.current_game_moves)):
-            self.next_move()
+        self.go_to_move(len(self.current_game_moves) - 1)
     
     def update_controls(self):
         #Actualizeaza starea butoanelor
@@ -180,11 +179,14 @@ class GameHistoryWindow(QMainWindow):
         self.prev_btn.setEnabled(self.current_move_index > -1)
         self.next_btn.setEnabled(self.current_move_index + 1 < len(self.current_game_moves))
         self.end_btn.setEnabled(self.current_move_index + 1 < len(self.current_game_moves))
+        self.ply_slider.blockSignals(True)
+        self.ply_slider.setValue(self.current_move_index)
+        self.ply_slider.blockSignals(False)
     
     def delete_game(self):
         current_item = self.games_list.currentItem()
         if current_item and self._confirm_delete():
-            self._delete_game_from_json(current_item)
+            self.store.delete(current_item.data(Qt.ItemDataRole.UserRole))
             self._update_ui_after_delete()
     
     def _confirm_delete(self):
@@ -195,15 +197,6 @@ class GameHistoryWindow(QMainWindow):
         )
         return reply == QMessageBox.StandardButton.Yes
     
-    def _delete_game_from_json(self, item):
-        with open("Jocuri.json", "r") as f:
-            games = json.load(f)
-        
-        games.pop(self.games_list.row(item))
-        
-        with open("Jocuri.json", "w") as f:
-            json.dump(games, f, indent=2)
-    
     def _update_ui_after_delete(self):
         self.games_list.takeItem(self.games_list.currentRow())
         self.delete_btn.setEnabled(False)
@@ -211,4 +204,5 @@ class GameHistoryWindow(QMainWindow):
     
     def closeEvent(self, event):
         self.eval_bar.cleanup()
-        super().closeEvent(event) 
\ No newline at end of file
+        self.store.close()
+        super().closeEvent(event) 
\ No newline at end of file
@@ -1,15 +1,14 @@
 from PyQt6.QtWidgets import QMainWindow, QWidget, QVBoxLayout, QHBoxLayout, QPushButton, QMessageBox
 from PyQt6.QtCore import pyqtSignal, QTimer
 from chess_board_widget import ChessBoardWidget
-from chess_models.chess_ai import ChessAI
-from stockFishBot import StockfishBot
+from engine_client import EngineClient
 from runGame import GameManager
 import chess
 
 class GameWindow(QMainWindow):
     closed = pyqtSignal()
     
-    def __init__(self, game_mode, stockfish_level=0):
+    def __init__(self, game_mode, stockfish_level=0, ponder=True):
         super().__init__()
         self.setWindowTitle("Chess Game")
         self.setMinimumSize(800, 600)
@@ -21,11 +20,15 @@ class GameWindow(QMainWindow):
         self.game_manager = GameManager()
         self._setup_game_manager(game_mode, stockfish_level)
         
-        # Inițializare modele
-        if "Model" in game_mode:
-            self.model = ChessAI()
-        if "Stockfish" in game_mode:
-            self.stockfish = StockfishBot(level=stockfish_level)
+        # Modelul si Stockfish ruleaza in procesul de motor; mutarile vin prin semnale
+        # Pondering: modelul cauta pe timpul adversarului (om sau Stockfish)
+        ponder = ponder and "Model" in game_mode and ("vs Player" in game_mode or "vs Stockfish" in game_mode)
+        self.engine = EngineClient(stockfish_level=stockfish_level, ponder=ponder, parent=self)
+        self.engine.move_ready.connect(self.on_engine_move)
+        self.engine.progress.connect(self.on_engine_progress)
+        self.engine.restarted.connect(self.on_engine_restarted)
+        self.engine.failed.connect(self.on_engine_failed)
+        self.engine_job = None
         
         # Setup UI
         self._setup_ui(game_mode)
@@ -94,7 +97,7 @@ class GameWindow(QMainWindow):
         if self.chess_board.board.board.is_capture(move):
             self.game_manager.stats["capturi"] += 1
         
-        if self.chess_board.board.board.is_check():
+        if self.chess_board.board.state.is_check:
             self.game_manager.stats["sahuri"] += 1
     
     def execute_move(self, move):
@@ -125,54 +128,70 @@ class GameWindow(QMainWindow):
         if "Model" in self.game_mode and "vs Player" in self.game_mode:
             QTimer.singleShot(500, self.make_model_move)
     
+    def request_engine_move(self, engine):
+        #Cerem mutarea motorului ("model" sau "stockfish"); raspunsul vine in on_engine_move
+        if self.engine.busy or self.chess_board.board.state.is_game_over:
+            return
+        self.engine_job = self.engine.request_move(engine, self.chess_board.board.board)
+    
     def make_model_move(self):
-        move = self.model.get_best_move(self.chess_board.board)
-        if move:
-            self.update_stats(move)
-            self.execute_move(move)
-            if not self.check_game_over() and self.auto_play:
-                QTimer.singleShot(100, self.make_next_move)
-            
-            self.chess_board.update()
+        self.request_engine_move("model")
     
     def make_next_move(self):
         #Mutarile in modurile automate
-        if self.chess_board.board.board.is_game_over():
+        if self.chess_board.board.state.is_game_over:
             self.check_game_over()
             return
         
-        is_whites_turn = self.chess_board.board.board.turn
-        
         if self.game_mode == "Model vs Model":
-            move = self.model.get_best_move(self.chess_board.board)
+            self.request_engine_move("model")
         else:
             is_model_white = "Model as White" in self.game_mode
-            if is_whites_turn == is_model_white:
-                move = self.model.get_best_move(self.chess_board.board)
-            else:
-                move = self.stockfish.get_best_move(self.chess_board.board)
+            is_whites_turn = self.chess_board.board.board.turn
+            self.request_engine_move("model" if is_whites_turn == is_model_white else "stockfish")
+    
+    def on_engine_move(self, job_id, move):
+        #Mutarea primita de la procesul de motor
+        if job_id != self.engine_job or move is None:
+            return
+        self.engine_job = None
+        self.statusBar().clearMessage()
+        self.update_stats(move)
+        self.execute_move(move)
         
-        if move:
-            self.update_stats(move)
-            self.execute_move(move)
-            
-            if not self.check_game_over() and self.auto_play:
-                QTimer.singleShot(100, self.make_next_move)
-            
-            self.chess_board.update()
+        if not self.check_game_over() and self.auto_play:
+            QTimer.singleShot(100, self.make_next_move)
+        
+        self.chess_board.update()
+    
+    def on_engine_progress(self, job_id, info):
+        #Progresul cautarii modelului, afisat in bara de stare
+        if job_id == self.engine_job:
+            self.statusBar().showMessage(
+                f"Adâncime {info['depth']}  scor {info['score'] / 100:+.2f}  {' '.join(info['pv'])}")
+    
+    def on_engine_restarted(self, job_id, exitcode):
+        #Procesul motorului a cazut si a fost repornit; cererea se reia automat
+        if job_id == self.engine_job:
+            self.statusBar().showMessage(f"Motorul a fost repornit (cod {exitcode}), reluăm căutarea...")
+    
+    def on_engine_failed(self, job_id, exitcode):
+        if job_id == self.engine_job:
+            self.engine_job = None
+            self.disable_controls()
+            QMessageBox.warning(self, "Eroare motor", f"Procesul motorului s-a oprit (cod {exitcode}).")
     
     def check_game_over(self):
         #Verifica daca s a terminat jocul
-        board = self.chess_board.board.board
+        outcome = self.chess_board.board.state.outcome
         
-        if board.is_fivefold_repetition():
+        if outcome is not None and outcome.termination == chess.Termination.FIVEFOLD_REPETITION:
             QMessageBox.information(self.chess_board, "Remiză!", "Jocul s-a terminat! Remiză prin repetiție de 5 ori!")
             self.game_manager.stats["scor"] = "1/2-1/2"
             self.disable_controls()
             self.game_manager.save_game()
             return True
         
-        outcome = board.outcome(claim_draw=False)
         if outcome is not None:
             if outcome.winner is not None:
                 winner = "Negru" if outcome.winner == chess.BLACK else "Alb"
@@ -202,7 +221,6 @@ class GameWindow(QMainWindow):
             self.make_next_move()
     
     def closeEvent(self, event):
-        if hasattr(self, 'stockfish'):
-            self.stockfish.close()
+        self.engine.close()
         self.closed.emit()
         super().closeEvent(event) 
\ No newline at end of file
@@ -6,11 +6,14 @@ sys.path.append(root_dir)
 
 from PyQt6.QtWidgets import QApplication
 from main_window import MainWindow
+from stockFishBot import EnginePool
 
 def main():
     app = QApplication(sys.argv)
     
     app.setStyle('Fusion')  
+    # Motoarele Stockfish ale barei de evaluare se opresc la iesire (firele lor nu sunt daemon)
+    app.aboutToQuit.connect(EnginePool.close_shared)
     
     window = MainWindow()
     window.show()
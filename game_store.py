@@ -0,0 +1,174 @@
+import json
+import os
+import sqlite3
+from datetime import datetime
+
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+DEFAULT_DB_PATH = os.path.join(BASE_DIR, "Utils", "Jocuri.db")
+
+# Fisierele JSON vechi, migrate o singura data (primul gasit): cel scris de aplicatie, apoi cel din Utils
+LEGACY_JSON_PATHS = ("Jocuri.json", os.path.join(BASE_DIR, "Utils", "Jocuri.json"))
+
+TIMESTAMP_FORMAT = "%d/%m/%Y %H:%M:%S"
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS games (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    game_mode TEXT NOT NULL,
+    played_at TEXT NOT NULL,
+    timestamp TEXT NOT NULL,
+    numar_miscari INTEGER NOT NULL DEFAULT 0,
+    capturi INTEGER NOT NULL DEFAULT 0,
+    sahuri INTEGER NOT NULL DEFAULT 0,
+    castigator TEXT,
+    scor TEXT,
+    mutari TEXT NOT NULL DEFAULT ''
+);
+CREATE INDEX IF NOT EXISTS games_mode ON games (game_mode, played_at);
+CREATE INDEX IF NOT EXISTS games_winner ON games (castigator, played_at);
+CREATE INDEX IF NOT EXISTS games_played_at ON games (played_at);
+CREATE TABLE IF NOT EXISTS meta (
+    key TEXT PRIMARY KEY,
+    value TEXT
+);
+"""
+
+COLUMNS = ("id", "game_mode", "timestamp", "numar_miscari", "capturi", "sahuri", "castigator", "scor", "mutari")
+
+
+def _played_at(timestamp):
+    #Data din formatul aplicatiei (zi/luna/an) in ISO, ca sa poata fi sortata si indexata
+    try:
+        return datetime.strptime(timestamp, TIMESTAMP_FORMAT).isoformat(sep=" ")
+    except (TypeError, ValueError):
+        return ""
+
+
+def _as_iso(value):
+    return value.isoformat(sep=" ") if isinstance(value, datetime) else value
+
+
+class GameStore:
+    # Partidele salvate, intr-o baza SQLite in modul WAL: adaugarea este un singur
+    # INSERT, stergerea o singura tranzactie, iar mai multe ferestre (sau procese)
+    # pot scrie simultan fara sa-si piarda partidele.
+    BUSY_TIMEOUT = 5.0
+
+    def __init__(self, path=DEFAULT_DB_PATH, migrate=True):
+        self.path = path
+        self.connection = sqlite3.connect(path, timeout=self.BUSY_TIMEOUT, isolation_level=None)
+        self.connection.execute("PRAGMA journal_mode=WAL")
+        self.connection.execute("PRAGMA synchronous=NORMAL")
+        self.connection.executescript(SCHEMA)
+        if migrate:
+            self.migrate_legacy()
+
+    def add(self, game):
+        #Adauga o partida (dictionarul din GameManager.save_game); intoarce id-ul ei
+        timestamp = game.get("timestamp") or datetime.now().strftime(TIMESTAMP_FORMAT)
+        cursor = self.connection.execute(
+            "INSERT INTO games (game_mode, played_at, timestamp, numar_miscari, capturi, sahuri, "
+            "castigator, scor, mutari) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)",
+            (game.get("game_mode", "Joc necunoscut"), _played_at(timestamp), timestamp,
+             game.get("numar_miscari", 0), game.get("capturi", 0), game.get("sahuri", 0),
+             game.get("castigator"), game.get("scor"), " ".join(game.get("mutari", []))))
+        return cursor.lastrowid
+
+    def delete(self, game_id):
+        #Sterge o partida; intoarce False daca nu exista
+        cursor = self.connection.execute("DELETE FROM games WHERE id = ?", (game_id,))
+        return cursor.rowcount > 0
+
+    def get(self, game_id):
+        row = self.connection.execute(
+            f"SELECT {', '.join(COLUMNS)} FROM games WHERE id = ?", (game_id,)).fetchone()
+        return self._game(row) if row else None
+
+    def _where(self, game_mode=None, winner=None, since=None, until=None):
+        clauses, params = [], []
+        if game_mode is not None:
+            clauses.append("game_mode = ?")
+            params.append(game_mode)
+        if winner is not None:
+            clauses.append("castigator = ?")
+            params.append(winner)
+        if since is not None:
+            clauses.append("played_at >= ?")
+            params.append(_as_iso(since))
+        if until is not None:
+            clauses.append("played_at < ?")
+            params.append(_as_iso(until))
+        return (" WHERE " + " AND ".join(clauses) if clauses else ""), params
+
+    def games(self, game_mode=None, winner=None, since=None, until=None, newest_first=False, limit=None,
+              moves=True):
+        #Partidele care corespund filtrelor, citite pe rand (fara sa incarcam toata baza);
+        #cu moves=False lista de mutari nu se citeste deloc
+        where, params = self._where(game_mode, winner, since, until)
+        columns = COLUMNS if moves else COLUMNS[:-1]
+        order = "DESC" if newest_first else "ASC"
+        query = f"SELECT {', '.join(columns)} FROM games{where} ORDER BY played_at {order}, id {order}"
+        if limit is not None:
+            query += " LIMIT ?"
+            params.append(limit)
+        for row in self.connection.execute(query, params):
+            yield self._game(row, columns)
+
+    def count(self, game_mode=None, winner=None, since=None, until=None):
+        where, params = self._where(game_mode, winner, since, until)
+        return self.connection.execute(f"SELECT COUNT(*) FROM games{where}", params).fetchone()[0]
+
+    def _game(self, row, columns=COLUMNS):
+        # Acelasi format ca in Jocuri.json, plus id-ul din baza
+        game = dict(zip(columns, row))
+        if "mutari" in game:
+            game["mutari"] = game["mutari"].split() if game["mutari"] else []
+        return game
+
+    def migrate_legacy(self, paths=LEGACY_JSON_PATHS):
+        #Importa o singura data partidele din primul Jocuri.json gasit; intoarce cate au fost importate
+        if self.connection.execute("SELECT value FROM meta WHERE key = 'migrated_from'").fetchone():
+            return 0
+        source = next((path for path in paths if os.path.exists(path)), None)
+        games = []
+        if source is not None:
+            try:
+                with open(source, "r") as f:
+                    games = json.load(f)
+            except (json.JSONDecodeError, OSError):
+                return 0
+
+        # Totul intr-o tranzactie: ori se importa tot, ori nimic (si se reincearca data viitoare)
+        with self.transaction():
+            if self.connection.execute("SELECT value FROM meta WHERE key = 'migrated_from'").fetchone():
+                return 0
+            for game in games:
+                self.add(game)
+            self.connection.execute("INSERT INTO meta (key, value) VALUES ('migrated_from', ?)",
+                                    (os.path.abspath(source) if source else "",))
+        return len(games)
+
+    def transaction(self):
+        return _Transaction(self.connection)
+
+    def close(self):
+        self.connection.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+class _Transaction:
+    # BEGIN IMMEDIATE ia blocarea de scriere de la inceput, ca doua procese sa nu migreze simultan
+    def __init__(self, connection):
+        self.connection = connection
+
+    def __enter__(self):
+        self.connection.execute("BEGIN IMMEDIATE")
+        return self.connection
+
+    def __exit__(self, exc_type, exc, tb):
+        self.connection.execute("COMMIT" if exc_type is None else "ROLLBACK")
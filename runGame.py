@@ -1,8 +1,6 @@
 from board import ChessBoard
-from chess_models.chess_ai import ChessAI
-from stockFishBot import StockfishBot
+from game_store import GameStore
 import chess
-import json
 from datetime import datetime
 
 class GameManager:
@@ -21,11 +19,7 @@ class GameManager:
         self.white_player_type = white_player_type
         self.black_player_type = black_player_type
         self.stockfish_level = stockfish_level
-        
-        if 'stockfish' in (white_player_type, black_player_type):
-            self.stockfish = StockfishBot(level=stockfish_level)
-        if 'model' in (white_player_type, black_player_type):
-            self.model = ChessAI()
+        # Motoarele ruleaza in procesul de motor (EngineWorker), nu aici
     
     def save_game(self):
         #Salvam Jocul
@@ -50,16 +44,9 @@ class GameManager:
             "mutari": self.game_moves
         }
 
-        try:
-            with open("Jocuri.json", "r") as f:
-                games = json.load(f)
-        except (FileNotFoundError, json.JSONDecodeError):
-            games = []
-
-        games.append(game_data)
-
-        with open("Jocuri.json", "w") as f:
-            json.dump(games, f, indent=2)
+        # O singura inserare in baza de partide, fara sa rescriem partidele vechi
+        with GameStore() as store:
+            return store.add(game_data)
 
     def determine_winner(self):
         if self.stats["scor"] == "1/2-1/2":
@@ -84,10 +71,5 @@ class GameManager:
             ) else "player"
         
         return "player(white)" if white_won else "player(black)"
-    
-    def cleanup(self):
-        #Inchidem Stockfish
-        if hasattr(self, 'stockfish'):
-            self.stockfish.close()
 
     
\ No newline at end of file
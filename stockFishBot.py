@@ -1,31 +1,203 @@
+import contextlib
+import os
+import shutil
+import threading
+import time
+
 import chess.engine
 from board import ChessBoard
 
+# Calea catre Stockfish se poate da prin variabila de mediu; altfel il cautam in PATH
+STOCKFISH_PATH_ENV = "STOCKFISH_PATH"
+STOCKFISH_POOL_SIZE_ENV = "STOCKFISH_POOL_SIZE"
+DEFAULT_STOCKFISH_PATH = "C:/Disertatie/Stockfish/stockfish-windows-x86-64-avx2.exe"
+DEFAULT_POOL_SIZE = 2
+
+
+def stockfish_path():
+    return os.environ.get(STOCKFISH_PATH_ENV) or shutil.which("stockfish") or DEFAULT_STOCKFISH_PATH
+
+
+class EnginePool:
+    # Procesele Stockfish ale aplicatiei, pornite la nevoie (cel mult size) si
+    # refolosite intre ferestre. Fiecare imprumut (lease) isi configureaza optiunile;
+    # optiunile ramase de la imprumutul anterior revin la valorile implicite.
+    # Firele python-chess ale motoarelor nu sunt daemon, asa ca procesul care a folosit
+    # pool-ul comun trebuie sa il inchida (close_shared) inainte de iesire.
+    HEALTH_CHECK_INTERVAL = 30.0  # secunde de inactivitate dupa care verificam procesul
+    ACQUIRE_TIMEOUT = 30.0
+
+    _shared = None
+    _shared_lock = threading.Lock()
+
+    def __init__(self, path=None, size=None):
+        self.path = path or stockfish_path()
+        self.size = max(1, size or int(os.environ.get(STOCKFISH_POOL_SIZE_ENV, DEFAULT_POOL_SIZE)))
+        self.condition = threading.Condition()
+        self.idle = []
+        self.engines = 0
+        # Optiunile setate si momentul ultimei folosiri, pentru fiecare motor
+        self.configured = {}
+        self.last_used = {}
+        self.closed = False
+        self.pid = os.getpid()
+
+    @classmethod
+    def shared(cls):
+        #Pool-ul comun al procesului
+        with cls._shared_lock:
+            if cls._shared is None or cls._shared.closed:
+                cls._shared = cls()
+            return cls._shared
+
+    @classmethod
+    def close_shared(cls):
+        #Inchide pool-ul comun, daca a fost creat (la iesirea aplicatiei / procesului de motor)
+        with cls._shared_lock:
+            pool = cls._shared
+        if pool is not None:
+            pool.close()
+
+    @classmethod
+    def _reset_after_fork(cls):
+        # Un proces copil (fork, ex. EngineWorker pe Linux) mosteneste motoarele parintelui,
+        # dar nu si firele python-chess care comunica cu ele: isi porneste propriul pool
+        cls._shared = None
+        cls._shared_lock = threading.Lock()
+
+    def _start_engine(self):
+        engine = chess.engine.SimpleEngine.popen_uci(self.path)
+        self.configured[engine] = {}
+        self.last_used[engine] = time.time()
+        return engine
+
+    def _discard(self, engine, graceful=False):
+        self.configured.pop(engine, None)
+        self.last_used.pop(engine, None)
+        with contextlib.suppress(Exception):
+            engine.quit() if graceful else engine.close()
+
+    def _healthy(self, engine):
+        #Motorul raspunde la isready (verificat doar dupa o pauza mai lunga)
+        if time.time() - self.last_used[engine] < self.HEALTH_CHECK_INTERVAL:
+            return True
+        try:
+            engine.ping()
+            return True
+        except (chess.engine.EngineError, chess.engine.EngineTerminatedError, TimeoutError):
+            return False
+
+    def acquire(self, options=None):
+        #Un motor liber (sau unul nou, daca nu am atins size), configurat cu options
+        deadline = time.time() + self.ACQUIRE_TIMEOUT
+        with self.condition:
+            while True:
+                if self.closed:
+                    raise RuntimeError("Pool-ul Stockfish este inchis")
+                if self.idle:
+                    engine = self.idle.pop()
+                    break
+                if self.engines < self.size:
+                    self.engines += 1
+                    engine = None
+                    break
+                if not self.condition.wait(timeout=max(0.0, deadline - time.time())):
+                    raise TimeoutError("Niciun motor Stockfish liber")
+
+        try:
+            if engine is not None and not self._healthy(engine):
+                self._discard(engine)
+                engine = None
+            if engine is None:
+                engine = self._start_engine()
+            self._configure(engine, options or {})
+        except Exception:
+            if engine is not None:
+                self._discard(engine)
+            with self.condition:
+                self.engines -= 1
+                self.condition.notify()
+            raise
+        return engine
+
+    def _configure(self, engine, options):
+        # Optiunile imprumutului anterior care lipsesc acum revin la valoarea implicita
+        previous = self.configured[engine]
+        changes = {name: value for name, value in options.items() if previous.get(name) != value}
+        for name in previous.keys() - options.keys():
+            option = engine.options.get(name)
+            if option is not None and option.default is not None:
+                changes[name] = option.default
+        if changes:
+            engine.configure(changes)
+        self.configured[engine] = dict(options)
+
+    def release(self, engine, broken=False):
+        with self.condition:
+            if broken or self.closed:
+                self._discard(engine, graceful=not broken)
+                self.engines -= 1
+            else:
+                self.last_used[engine] = time.time()
+                self.idle.append(engine)
+            self.condition.notify()
+
+    @contextlib.contextmanager
+    def lease(self, options=None):
+        #with pool.lease({"Skill Level": 5}) as engine: ...
+        engine = self.acquire(options)
+        broken = False
+        try:
+            yield engine
+        except chess.engine.EngineTerminatedError:
+            broken = True
+            raise
+        finally:
+            self.release(engine, broken)
+
+    def close(self):
+        #Oprim toate motoarele libere; cele imprumutate se opresc la eliberare
+        if self.pid != os.getpid():
+            # Pool mostenit printr-un fork: motoarele apartin procesului parinte
+            return
+        with self.condition:
+            self.closed = True
+            idle, self.idle = self.idle, []
+            self.engines -= len(idle)
+            self.condition.notify_all()
+        for engine in idle:
+            self._discard(engine, graceful=True)
+
+
+if hasattr(os, "register_at_fork"):
+    os.register_at_fork(after_in_child=EnginePool._reset_after_fork)
+
+
 class StockfishBot:
-    def __init__(self, level: int = 0):
-        
-        self.engine = chess.engine.SimpleEngine.popen_uci("C:/Disertatie/Stockfish/stockfish-windows-x86-64-avx2.exe")
-        
-        
+    def __init__(self, level: int = 0, threads: int = 1, hash_mb: int = 16, pool: EnginePool = None):
+
+        # Motoarele vin din pool-ul comun (cautat la fiecare apel, ca dupa un fork sa fie
+        # pool-ul procesului curent); fiecare apel imprumuta unul cu optiunile acestui bot
+        self._pool = pool
+
         self.level = max(0, min(20, level))
-        self.engine.configure({"Skill Level": self.level})
+        self.options = {"Skill Level": self.level, "Threads": threads, "Hash": hash_mb}
         self.default_move_time = 0.1
         self.default_eval_time = 0.05 if self.level < 10 else 0.1
 
+    @property
+    def pool(self):
+        return self._pool or EnginePool.shared()
+
     def get_best_move(self, board: ChessBoard):
         #Cea mai buna mutare
-        result = self.engine.play(board.board, chess.engine.Limit(time=self.default_move_time))
+        with self.pool.lease(self.options) as engine:
+            result = engine.play(board.board, chess.engine.Limit(time=self.default_move_time))
         return result.move
 
     def get_evaluation(self, board: ChessBoard):
         #Evaluare
-        info = self.engine.analyse(board.board, chess.engine.Limit(time=self.default_eval_time))
+        with self.pool.lease(self.options) as engine:
+            info = engine.analyse(board.board, chess.engine.Limit(time=self.default_eval_time))
         evaluation = info.get("score")
         return evaluation.relative.score() if evaluation.relative else None
-
-    def close(self):
-        #inchidem Stockfish
-        self.engine.quit()
-
-
-
@@ -0,0 +1,276 @@
+import os
+import sys
+import threading
+
+import chess
+
+from board import ChessBoard
+from chess_models.chess_ai import ChessAI
+from chess_models.opening_book import DEFAULT_BOOK_PATH
+from chess_models.search_stats import SearchListener
+from chess_models.time_manager import TimeManager
+
+ENGINE_NAME = "ChessAI"
+ENGINE_AUTHOR = "Chess Desktop App"
+
+# Optiunile UCI: (tip, implicit, minim, maxim)
+OPTIONS = {
+    "Hash": ("spin", 16, 1, 1024),
+    "Threads": ("spin", 1, 1, os.cpu_count() or 1),
+    "Ponder": ("check", False, None, None),
+    "OwnBook": ("check", True, None, None),
+    "SyzygyPath": ("string", "", None, None),
+}
+
+# Cate mutari din varianta principala trimitem in liniile info
+MAX_PV = 16
+
+
+class UciInfoListener(SearchListener):
+    # Transforma evenimentele "depth" ale cautarii in linii "info" UCI
+    def __init__(self, engine):
+        self.engine = engine
+
+    def on_event(self, event, data):
+        if event == "depth":
+            self.engine.send_info(data)
+
+
+class UciEngine:
+    # Bucla de protocol UCI. Cautarea ruleaza pe un fir separat, ca "stop" si
+    # "ponderhit" sa poata fi citite de pe stdin in timpul ei.
+
+    def __init__(self, output=sys.stdout):
+        self.output = output
+        self.output_lock = threading.Lock()
+        self.options = {name: spec[1] for name, spec in OPTIONS.items()}
+        self.ai = None
+        self.ai_options = None
+        self.board = ChessBoard()
+        # Tabla pe care cauta motorul: acelasi obiect pe toata partida, ca sesiunea ChessAI
+        # sa aplice doar mutarile noi (vezi sync_search_board)
+        self.search_board = ChessBoard()
+        self.thread = None
+        self.time_manager = None
+        # Setat cand "go infinite"/"go ponder" pot trimite bestmove (dupa stop/ponderhit)
+        self.release = threading.Event()
+
+    def send(self, line):
+        with self.output_lock:
+            self.output.write(line + "\n")
+            self.output.flush()
+
+    def engine(self):
+        #Motorul cu optiunile curente; il refacem doar cand Hash/Threads/carte/Syzygy s-au schimbat
+        options = (self.options["Hash"], self.options["Threads"], self.options["OwnBook"],
+                   self.options["SyzygyPath"])
+        if self.ai is None or options != self.ai_options:
+            if self.ai is not None:
+                self.ai.close()
+            hash_mb, threads, own_book, syzygy_path = options
+            self.ai = ChessAI(hash_mb=hash_mb, threads=threads,
+                              book=DEFAULT_BOOK_PATH if own_book else None,
+                              syzygy_path=syzygy_path or None)
+            self.ai.add_listener(UciInfoListener(self))
+            self.ai_options = options
+        return self.ai
+
+    def run(self, stream=sys.stdin):
+        for line in stream:
+            if not self.handle(line):
+                break
+        self.stop()
+        if self.ai is not None:
+            self.ai.close()
+
+    def handle(self, line):
+        #Executa o comanda; intoarce False la "quit"
+        tokens = line.split()
+        if not tokens:
+            return True
+        command, args = tokens[0], tokens[1:]
+        if command == "uci":
+            self.send(f"id name {ENGINE_NAME}")
+            self.send(f"id author {ENGINE_AUTHOR}")
+            for name, (kind, default, low, high) in OPTIONS.items():
+                if kind == "spin":
+                    self.send(f"option name {name} type spin default {default} min {low} max {high}")
+                elif kind == "check":
+                    self.send(f"option name {name} type check default {str(default).lower()}")
+                else:
+                    self.send(f"option name {name} type string default {default or '<empty>'}")
+            self.send("uciok")
+        elif command == "isready":
+            if self.thread is None:
+                self.engine()
+            self.send("readyok")
+        elif command == "setoption":
+            self.set_option(args)
+        elif command == "ucinewgame":
+            self.stop()
+            self.engine().new_game()
+        elif command == "position":
+            self.stop()
+            self.set_position(args)
+        elif command == "go":
+            self.go(args)
+        elif command == "stop":
+            self.stop()
+        elif command == "ponderhit":
+            if self.time_manager is not None:
+                self.time_manager.ponderhit()
+                self.release.set()
+        elif command == "quit":
+            return False
+        return True
+
+    def set_option(self, args):
+        #setoption name <nume cu spatii> [value <valoare>]
+        if "name" not in args:
+            return
+        value_index = args.index("value") if "value" in args else len(args)
+        name = " ".join(args[args.index("name") + 1:value_index])
+        value = " ".join(args[value_index + 1:])
+        match = next((option for option in OPTIONS if option.lower() == name.lower()), None)
+        if match is None:
+            self.send(f"info string optiune necunoscuta {name}")
+            return
+        kind, default, low, high = OPTIONS[match]
+        if kind == "spin":
+            try:
+                self.options[match] = max(low, min(high, int(value)))
+            except ValueError:
+                self.send(f"info string valoare invalida pentru {match}: {value}")
+        elif kind == "check":
+            self.options[match] = value.lower() == "true"
+        else:
+            self.options[match] = "" if value == "<empty>" else value
+
+    def set_position(self, args):
+        #position [startpos | fen <fen>] [moves <m1> <m2> ...]
+        # Pastram acelasi obiect ChessBoard, ca sesiunea sa aplice doar mutarile noi
+        moves_index = args.index("moves") if "moves" in args else len(args)
+        if args and args[0] == "fen":
+            fen = " ".join(args[1:moves_index])
+        else:
+            fen = chess.STARTING_FEN
+        board = self.board.board
+        try:
+            board.set_fen(fen)
+            for move in args[moves_index + 1:]:
+                board.push_uci(move)
+        except ValueError as error:
+            self.send(f"info string pozitie invalida: {error}")
+            board.reset()
+
+    def time_manager_from(self, args):
+        #Parametrii lui "go" (timpi in milisecunde) pentru TimeManager
+        params, infinite, ponder = {}, False, False
+        i = 0
+        while i < len(args):
+            key = args[i]
+            if key == "infinite":
+                infinite = True
+            elif key == "ponder":
+                ponder = True
+            elif key in ("wtime", "btime", "winc", "binc", "movestogo", "movetime", "depth", "nodes") \
+                    and i + 1 < len(args):
+                params[key] = int(args[i + 1])
+                i += 1
+            i += 1
+
+        white = self.board.board.turn == chess.WHITE
+        remaining = params.get("wtime" if white else "btime")
+        increment = params.get("winc" if white else "binc", 0)
+        movetime = params.get("movetime")
+        limited = remaining is not None or movetime is not None or "depth" in params or "nodes" in params
+        return TimeManager(
+            remaining=remaining / 1000 if remaining is not None else None,
+            increment=increment / 1000,
+            moves_to_go=params.get("movestogo"),
+            movetime=movetime / 1000 if movetime is not None else None,
+            nodes=params.get("nodes"),
+            depth=params.get("depth"),
+            # "go" fara limite este tot o cautare infinita
+            infinite=infinite or ponder or not limited,
+        )
+
+    def go(self, args):
+        self.stop()
+        ai = self.engine()
+        self.time_manager = self.time_manager_from(args)
+        self.release.clear()
+        if not self.time_manager.infinite:
+            self.release.set()
+
+        # Cautarea lucreaza pe tabla ei, ca "position" sa nu schimbe tabla sub ea
+        self.sync_search_board()
+        self.thread = threading.Thread(target=self._search, args=(ai, self.search_board, self.time_manager),
+                                       daemon=True)
+        self.thread.start()
+
+    def sync_search_board(self):
+        #Aducem tabla cautarii la pozitia curenta: anulam doar mutarile care difera si le
+        #jucam pe cele noi (o pozitie de start diferita inseamna o partida noua)
+        source, target = self.board.board, self.search_board.board
+        root_fen = source.root().fen()
+        if target.root().fen() != root_fen:
+            target.set_fen(root_fen)
+        common = 0
+        for ours, theirs in zip(target.move_stack, source.move_stack):
+            if ours != theirs:
+                break
+            common += 1
+        while len(target.move_stack) > common:
+            target.pop()
+        for move in source.move_stack[common:]:
+            target.push(move)
+
+    def _search(self, ai, board, time_manager):
+        if board.board.is_game_over():
+            self.release.wait()
+            self.send("bestmove 0000")
+            return
+        move = ai.get_best_move(board, time_manager)
+
+        # Varianta principala incepe cu mutarea aleasa; a doua mutare este raspunsul de ponderat
+        pv = ai.chess_principal_variation(board, MAX_PV)
+        ponder = pv[1] if len(pv) > 1 and pv[0] == move else None
+
+        # In modurile infinite/ponder, bestmove se trimite abia dupa stop sau ponderhit
+        self.release.wait()
+        self.send(f"bestmove {move.uci()}" + (f" ponder {ponder.uci()}" if ponder else ""))
+
+    def send_info(self, data):
+        #Apelat de pe firul cautarii, la fiecare adancime terminata
+        ai = self.ai
+        pv = ai.chess_principal_variation(self.search_board, MAX_PV)
+        score = data["score"]
+        if abs(score) >= ai.CHECKMATE_LOWER:
+            mate = (len(pv) + 1) // 2 or 1
+            score_text = f"mate {mate if score > 0 else -mate}"
+        else:
+            score_text = f"cp {score}"
+        line = (f"info depth {data['depth']} score {score_text} nodes {data['nodes']} "
+                f"nps {data['nps']} time {int(data['time'] * 1000)}")
+        if pv:
+            line += " pv " + " ".join(move.uci() for move in pv)
+        self.send(line)
+
+    def stop(self):
+        #Opreste cautarea in curs si asteapta bestmove
+        if self.thread is None:
+            return
+        self.time_manager.stop()
+        self.release.set()
+        self.thread.join()
+        self.thread = None
+
+
+def main():
+    UciEngine().run()
+
+
+if __name__ == "__main__":
+    # Pornire ca motor separat: python uci.py (ex. chess.engine.SimpleEngine.popen_uci)
+    main()